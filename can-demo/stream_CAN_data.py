@@ -1,4 +1,5 @@
 import time
+import numpy as np
 import connect_python
 import can
 import cantools
@@ -8,6 +9,9 @@ logger = connect_python.get_logger(__name__)
 
 db = cantools.database.load_file("canmod-temp.dbc")
 
+# Frame ID of the "Thermocouple" message in the DBC
+THERMO_ID = 1
+
 sim_data = [
     [25, 1, 23, 0, 23, 0, 24, 3, 29],
     [25, 1, 24, 0, 23, 2, 24, 0, 28],
@@ -132,19 +136,19 @@ sim_data = [
     [25, 0, 26, 0, 27, 0, 24, 0, 28],
 ]
 
-Error_dict_db = {
-    "OK": 0,
-    "ERR1": 1,
-    "ERR2": 1,
-    "ERR3": 1,
-}
+# Stream ids of the temperature signals and channel names of the alarms stream
+temp_ids = ("CJTemp", "TLTemp", "TRTemp", "BLTemp", "BRTemp")
+channel_ids = ("TLStatus", "TRStatus", "BLStatus", "BRStatus")
+
+# Alarm value for each raw sim status code, indexed by status
+SIM_ERR = (1, 0, 0, 0)
 
-Error_dict_sim = {
-    0: 1,
-    1: 0,
-    2: 0,
-    3: 0,
-}
+# Split the static sim table into temperature, status and alarm columns once
+sim_arr = np.array(sim_data, dtype=np.int16)
+sim_temps = sim_arr[:, [0, 2, 4, 6, 8]].tolist()
+sim_status_arr = sim_arr[:, [1, 3, 5, 7]]
+sim_statuses = sim_status_arr.tolist()
+sim_alarms = np.array(SIM_ERR, dtype=np.int8)[sim_status_arr].tolist()
 
 
 # Manual Decoding
@@ -181,7 +185,7 @@ Error_dict_sim = {
 @connect_python.main
 def stream_data(client: connect_python.Client):
     simulated_data = client.get_value("simulated_data", False)
-    for stream_name in ["CJTemp", "TLTemp", "TRTemp", "BLTemp", "BRTemp", "alarms"]:
+    for stream_name in temp_ids + ("alarms",):
         client.clear_stream(stream_name)
 
     def send_status_alarms(stream_name, status_value, t):
@@ -190,39 +194,25 @@ def stream_data(client: connect_python.Client):
         client.stream(f"{stream_name}.error2", t, 1.0 if status_value == 2 else 0.0)
         client.stream(f"{stream_name}.error3", t, 1.0 if status_value == 3 else 0.0)
 
-    channel_ids = [
-        "TLStatus",
-        "TRStatus",
-        "BLStatus",
-        "BRStatus",
-    ]
-
     if simulated_data:
-        for data in sim_data:
+        period = 0.25
+        deadline = time.perf_counter()
+        for temps, statuses, alarms in zip(sim_temps, sim_statuses, sim_alarms):
             t = time.time()
-            client.stream("CJTemp", t, data[0])
-            client.stream("TLTemp", t, data[2])
-            client.stream("TRTemp", t, data[4])
-            client.stream("BLTemp", t, data[6])
-            client.stream("BRTemp", t, data[8])
-            client.stream(
-                "alarms",
-                t,
-                names=channel_ids,
-                values=[
-                    Error_dict_sim[data[1]],
-                    Error_dict_sim[data[3]],
-                    Error_dict_sim[data[5]],
-                    Error_dict_sim[data[7]],
-                ],
-            )
+            for stream_name, value in zip(temp_ids, temps):
+                client.stream(stream_name, t, value)
+            client.stream("alarms", t, names=channel_ids, values=alarms)
 
-            if any([data[1], data[3], data[5], data[7]]):  # If any status is non-zero
+            if any(statuses):  # If any status is non-zero
                 logger.warning(
-                    f"Temp warn at t={t}s: TL={data[1]}, TR={data[3]}, BL={data[5]}, BR={data[7]}"
+                    "Temp warn at t=%ss: TL=%s, TR=%s, BL=%s, BR=%s", t, *statuses
                 )
 
-            time.sleep(0.25)
+            # Sleep until the next tick so processing time doesn't stretch the period
+            deadline += period
+            sleep_for = deadline - time.perf_counter()
+            if sleep_for > 0:
+                time.sleep(sleep_for)
 
     else:
         available_channels = can.detect_available_configs("pcan")
@@ -236,38 +226,63 @@ def stream_data(client: connect_python.Client):
             interface="pcan", channel=PCAN_address["channel"], bitrate=bitrate
         )
 
+        # Look up the message definition once instead of dispatching per frame
+        decode = db.get_message_by_frame_id(THERMO_ID).decode
+
+        # Buffer frames and flush them with one stream_batch call per stream
+        batch_size = 10
+        timestamps = []
+        temp_rows = []
+        status_rows = []
+
+        def flush():
+            if not timestamps:
+                return
+            for i, stream_name in enumerate(temp_ids):
+                client.stream_batch(
+                    stream_name,
+                    timestamps=timestamps,
+                    names=[stream_name],
+                    values=[[row[i]] for row in temp_rows],
+                )
+            client.stream_batch(
+                "alarms", timestamps=timestamps, names=channel_ids, values=status_rows
+            )
+            timestamps.clear()
+            temp_rows.clear()
+            status_rows.clear()
+
         try:
             for msg in connection:
+                if msg.arbitration_id != THERMO_ID:
+                    continue
+
                 t = time.time()
 
-                decoded = db.decode_message(msg.arbitration_id, msg.data)
-
-                client.stream("CJTemp", t, decoded["CJTemp"])
-                client.stream("TLTemp", t, decoded["TLTemp"])
-                client.stream("TRTemp", t, decoded["TRTemp"])
-                client.stream("BLTemp", t, decoded["BLTemp"])
-                client.stream("BRTemp", t, decoded["BRTemp"])
-                client.stream(
-                    "alarms",
-                    t,
-                    names=channel_ids,
-                    values=[
-                        Error_dict_db[decoded["TLStatus"]],
-                        Error_dict_db[decoded["TRStatus"]],
-                        Error_dict_db[decoded["BLStatus"]],
-                        Error_dict_db[decoded["BRStatus"]],
-                    ],
-                )
+                decoded = decode(msg.data, decode_choices=False)
+                tls, trs, bls, brs = (decoded[k] for k in channel_ids)
 
+                # Raw status values (decode_choices=False): 0 = OK, 1-3 = Err1-Err3
                 statuses = [
-                    Error_dict_db[decoded["TLStatus"]],
-                    Error_dict_db[decoded["TRStatus"]],
-                    Error_dict_db[decoded["BLStatus"]],
-                    Error_dict_db[decoded["BRStatus"]],
+                    1 if tls else 0,
+                    1 if trs else 0,
+                    1 if bls else 0,
+                    1 if brs else 0,
                 ]
+                timestamps.append(t)
+                temp_rows.append([decoded[k] for k in temp_ids])
+                status_rows.append(statuses)
+                if len(timestamps) >= batch_size:
+                    flush()
+
                 if any(statuses):
                     logger.warning(
-                        f"Temperature warning at t={t:.1f}s: TL={decoded['TLStatus']}, TR={decoded['TRStatus']}, BL={decoded['BLStatus']}, BR={decoded['BRStatus']}"
+                        "Temperature warning at t=%.1fs: TL=%s, TR=%s, BL=%s, BR=%s",
+                        t,
+                        tls,
+                        trs,
+                        bls,
+                        brs,
                     )
 
                 time.sleep(0.015)
@@ -275,6 +290,7 @@ def stream_data(client: connect_python.Client):
         except KeyboardInterrupt:
             pass
         finally:
+            flush()
             if "connection" in locals():
                 connection.shutdown()
 
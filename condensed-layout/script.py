@@ -1,5 +1,5 @@
+import math
 import time
-import numpy as np
 from datetime import datetime
 import connect_python
 import nominal as nm
@@ -40,25 +40,27 @@ def stream_data(client: connect_python.Client):
         client.clear_stream("tangent_wave")
 
         start = time.time()
-        last_log_time = time.time()
+        last_log_time = start
+        period = 0.015
+        deadline = time.perf_counter()
 
         while True:
+            # Read the clock once per tick; the same t feeds every stream and the log check
             t = time.time()
-            delta = t - start
-            sine = np.sin(delta * frequency) + y_offset
-            cosine = np.cos(delta * frequency) + y_offset
-            tangent = np.tan(delta * frequency) + y_offset
+            phase = (t - start) * frequency
+            sine = math.sin(phase) + y_offset
+            cosine = math.cos(phase) + y_offset
+            tangent = math.tan(phase) + y_offset
 
             # Log values once per second
-            current_time = time.time()
-            if current_time - last_log_time >= 1.0:
+            if t - last_log_time >= 1.0:
                 color = GREEN if tangent >= 0 else RED
                 logger.info(f"Tangent value: {color}{tangent:.3f}{RESET}")
-                last_log_time = current_time
+                last_log_time = t
 
-            client.stream("sine_wave", t, float(sine))
-            client.stream("cosine_wave", t, float(cosine))
-            client.stream("tangent_wave", t, float(tangent))
+            client.stream("sine_wave", t, sine)
+            client.stream("cosine_wave", t, cosine)
+            client.stream("tangent_wave", t, tangent)
 
             if write_stream:
                 tags = None
@@ -67,11 +69,16 @@ def stream_data(client: connect_python.Client):
 
                 write_stream.enqueue(
                     channel_name=channel if channel else "Unnamed_channel",
-                    timestamp=datetime.now(),
-                    value=float(sine),
+                    timestamp=datetime.fromtimestamp(t),
+                    value=sine,
                     tags=tags,
                 )
-            time.sleep(0.015)  # Add a small delay
+
+            # Sleep until the next tick so processing time doesn't stretch the period
+            deadline += period
+            sleep_for = deadline - time.perf_counter()
+            if sleep_for > 0:
+                time.sleep(sleep_for)
     except Exception as e:
         logger.error(f"Error in stream_data: {e}")
 
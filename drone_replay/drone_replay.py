@@ -1,10 +1,10 @@
 from pathlib import Path
+import math
 import connect_python
 import numpy as np
 import time
 from mcap.reader import make_reader
 from mcap_ros1.decoder import DecoderFactory
-from scipy.spatial.transform import Rotation as R
 
 # Debug flag to control verbose output
 DEBUG = False
@@ -18,6 +18,18 @@ transform_topics = ["/vrpn_client/raw_transform"]
 imu_topics = ["/imu0"]
 all_topics = camera_topics + transform_topics + imu_topics
 
+# Message kinds, dispatched on by integer instead of comparing topic strings
+CAMERA_LEFT, CAMERA_RIGHT, TRANSFORM, IMU = range(4)
+topic_kinds = {
+    "/cam0/image_raw": CAMERA_LEFT,
+    "/cam1/image_raw": CAMERA_RIGHT,
+    "/vrpn_client/raw_transform": TRANSFORM,
+    "/imu0": IMU,
+}
+
+# Number of IMU samples buffered before sending them with one stream_batch call
+IMU_BATCH_SIZE = 10
+
 
 @connect_python.main
 def stream_data(client: connect_python.Client):
@@ -31,113 +43,189 @@ def stream_data(client: connect_python.Client):
     client.clear_frame_buffer("camera_left")
     client.clear_frame_buffer("camera_right")
 
-    # Open and read the MCAP file with ROS1 decoder
-    with open(mcap_path, "rb") as f:
-        reader = make_reader(f, decoder_factories=[DecoderFactory()])
+    # Decode the whole MCAP file up front so the realtime loop only streams
+    timestamps, kinds, payloads = load_messages(mcap_path)
+
+    previous_position = None
+    prev_timestamp_mocap = None
+
+    imu_timestamps = np.empty(IMU_BATCH_SIZE, dtype=np.float64)
+    imu_values = np.empty((IMU_BATCH_SIZE, 4), dtype=np.float64)
+    imu_count = 0
+
+    replay_start = time.perf_counter()
+    for timestamp_sec, kind, payload in zip(timestamps, kinds, payloads):
+        # wait until this message is due to make the streaming look realtime,
+        # scheduling against the replay start so processing time doesn't drift
+        sleep_for = replay_start + timestamp_sec - time.perf_counter()
+        if sleep_for > 0:
+            time.sleep(sleep_for)
+
+        if kind == IMU:
+            # Buffer acceleration data and send it in batches
+            imu_timestamps[imu_count] = timestamp_sec
+            imu_values[imu_count] = payload
+            imu_count += 1
+            if imu_count == IMU_BATCH_SIZE:
+                stream_imu_data(client, imu_timestamps, imu_values)
+                imu_count = 0
+
+        elif kind == TRANSFORM:
+            # delta time between mocap messages for velocity calculation
+            dt_mocap: float | None = None
+            if prev_timestamp_mocap is not None:
+                dt_mocap = timestamp_sec - prev_timestamp_mocap
+
+            previous_position = stream_transform_data(
+                client,
+                timestamp_sec,
+                payload,
+                previous_position,
+                dt_mocap,
+                DEBUG,
+            )
+            prev_timestamp_mocap = timestamp_sec
+
+        else:
+            width, rgb_data = payload
+            camera = "camera_left" if kind == CAMERA_LEFT else "camera_right"
+            client.stream_rgb(camera, timestamp_sec, width, rgb_data)
+
+        # Stop after desired number of frames
+        # if timestamp_sec > 10.0:
+        #     break
+
+    if imu_count:
+        stream_imu_data(client, imu_timestamps[:imu_count], imu_values[:imu_count])
+
+
+def load_messages(path):
+    """
+    Decode every replayed message from an MCAP file into memory
+
+    Messages before the first transform (motion capture data) are dropped and
+    timestamps are made relative to it. IMU messages are reduced to their
+    acceleration values (derived for all samples at once) and camera frames
+    are converted to RGB, so replaying them is just indexing.
+
+    Args:
+        path: Path to the MCAP file
+
+    Returns:
+        Tuple of (timestamps, kinds, payloads) in log order, where timestamps is
+        an array of seconds since the first transform, kinds holds the message
+        kind of each entry and payloads holds [ax, ay, az, magnitude] for IMU,
+        the ROS message for transforms and (width, rgb_data) for cameras
+    """
+    timestamps = []
+    kinds = []
+    payloads = []
+
+    # Raw IMU accelerations and their positions in payloads, derived in one pass
+    imu_raw = []
+    imu_positions = []
+
+    decoder_factory = DecoderFactory()
+
+    # Open and read the MCAP file, decoding ROS1 messages only once they are kept
+    with open(path, "rb") as f:
+        reader = make_reader(f)
 
         first_timestamp = None
-        previous_position = None
-        prev_timestamp = None
-        prev_timestamp_mocap = None
 
-        # Process all messages using decoded ROS messages
-        for schema, channel, message, ros_msg in reader.iter_decoded_messages(
-            topics=all_topics
+        # channel id -> message kind / ROS1 decoder, filled in as channels are first seen
+        channel_kinds = {}
+        decoders = {}
+
+        for schema, channel, message in reader.iter_messages(
+            topics=all_topics, log_time_order=True
         ):
+            kind = channel_kinds.get(channel.id)
+            if kind is None:
+                kind = channel_kinds[channel.id] = topic_kinds[channel.topic]
+
             # Get timestamp in seconds
             original_timestamp_sec = message.log_time / 1e9
 
             # skip all data until we have the first transform (motion capture data)
-            if (
-                channel.topic == "/vrpn_client/raw_transform"
-                and first_timestamp is None
-            ):
+            if kind == TRANSFORM and first_timestamp is None:
                 first_timestamp = original_timestamp_sec
                 if DEBUG:
                     print(f"Found first position at time {first_timestamp:.2f}s")
 
-            # Skip camera processing until we have a transform
+            # Skip (without decoding) all messages until we have a transform
             if first_timestamp is None:
                 continue
 
-            # Calculate normalized timestamp for camera frames
-            timestamp_sec = original_timestamp_sec - first_timestamp
+            decoder = decoders.get(channel.id)
+            if decoder is None:
+                decoder = decoders[channel.id] = decoder_factory.decoder_for(
+                    channel.message_encoding, schema
+                )
+            ros_msg = decoder(message.data)
 
-            # delta time between messages to make the streaming look realtime
-            dt: float | None = None
-            if prev_timestamp is not None:
-                dt = timestamp_sec - prev_timestamp
-            prev_timestamp = timestamp_sec
+            if kind == IMU:
+                accel = ros_msg.linear_acceleration
+                imu_raw.append((accel.x, accel.y, accel.z))
+                imu_positions.append(len(payloads))
+                payload = None
+            elif kind == TRANSFORM:
+                payload = ros_msg
+            else:
+                payload = (ros_msg.width, convert_image_to_rgb(ros_msg))
 
-            # delta time between mocap messages for velocity calculation
-            dt_mocap: float | None = None
-            if prev_timestamp_mocap is not None:
-                dt_mocap = timestamp_sec - prev_timestamp_mocap
+            # Calculate normalized timestamp
+            timestamps.append(original_timestamp_sec - first_timestamp)
+            kinds.append(kind)
+            payloads.append(payload)
 
-            # Handle IMU messages to get acceleration data
-            if channel.topic in imu_topics:
-                stream_imu_data(client, timestamp_sec, ros_msg, DEBUG)
-
-            if channel.topic == "/vrpn_client/raw_transform":
-                previous_position = stream_transform_data(
-                    client,
-                    timestamp_sec,
-                    ros_msg,
-                    previous_position,
-                    dt_mocap,
-                    DEBUG,
-                )
-                prev_timestamp_mocap = timestamp_sec
-            # Process camera feeds
-            if channel.topic in ["/cam0/image_raw", "/cam1/image_raw"]:
-                # Process image message directly
-                rgb_data = convert_image_to_rgb(ros_msg)
-
-                if channel.topic == "/cam0/image_raw":
-                    client.stream_rgb(
-                        "camera_left", timestamp_sec, ros_msg.width, rgb_data
-                    )
-                else:
-                    client.stream_rgb(
-                        "camera_right", timestamp_sec, ros_msg.width, rgb_data
-                    )
-
-            # Stop after desired number of frames
-            # if timestamp_sec > 10.0:
-            #     break
-
-            if dt is not None:
-                time.sleep(dt)
-
-
-def stream_imu_data(client, timestamp_sec, imu_msg, debug=False):
+    for position, values in zip(imu_positions, derive_imu_data(imu_raw, DEBUG)):
+        payloads[position] = values
+
+    return np.array(timestamps, dtype=np.float64), kinds, payloads
+
+
+def derive_imu_data(raw_accel, debug=False):
     """
-    Extract and stream IMU data from a ROS IMU message
+    Convert raw IMU linear accelerations into drone frame acceleration data
 
     Args:
-        client: Connect client
-        timestamp_sec: Timestamp in seconds
-        imu_msg: ROS IMU message
+        raw_accel: Sequence of (x, y, z) linear accelerations from ROS IMU messages
         debug: Debug flag
+
+    Returns:
+        (N, 4) array of [ax, ay, az, magnitude] rows with gravity removed
     """
-    # Get linear acceleration values directly from the message
-    ax = -imu_msg.linear_acceleration.x
-    ay = imu_msg.linear_acceleration.y
-    az = imu_msg.linear_acceleration.z
+    raw_accel = np.asarray(raw_accel, dtype=np.float64).reshape(-1, 3)
+    accel = np.empty((len(raw_accel), 4), dtype=np.float64)
 
+    accel[:, 0] = -raw_accel[:, 0]
+    accel[:, 1] = raw_accel[:, 1]
     # subtract gravity from the acceleration
-    az -= 9.81
-
-    accel_magnitude = np.sqrt(ax * ax + ay * ay + az * az)
+    accel[:, 2] = raw_accel[:, 2] - 9.81
+    accel[:, 3] = np.sqrt(np.square(accel[:, :3]).sum(axis=1))
 
     if debug:
-        print(f"Normalized acceleration: ax={ax:.2f}, ay={ay:.2f}, az={az:.2f}")
+        for ax, ay, az, _ in accel:
+            print(f"Normalized acceleration: ax={ax:.2f}, ay={ay:.2f}, az={az:.2f}")
 
-    client.stream(
+    return accel
+
+
+def stream_imu_data(client, timestamps, values):
+    """
+    Stream a batch of acceleration samples
+
+    Args:
+        client: Connect client
+        timestamps: Array of timestamps in seconds
+        values: (len(timestamps), 4) array of [ax, ay, az, magnitude] rows
+    """
+    client.stream_batch(
         "drone_acceleration",
-        timestamp_sec,
+        timestamps=timestamps,
         names=["x", "y", "z", "magnitude"],
-        values=[ax, ay, az, accel_magnitude],
+        values=values,
     )
 
 
@@ -185,8 +273,7 @@ def stream_transform_data(
     # Bevy x axis is drone x
     # Bevy y axis is drone z (up)
     # Bevy z axis is drone -y (forward)
-    rot = R.from_quat([qx, qz, -qy, qw])
-    heading_deg, pitch_deg, roll_deg = rot.as_euler("YXZ", degrees=True)
+    heading_deg, pitch_deg, roll_deg = quat_to_yxz_degrees(qx, qz, -qy, qw)
 
     # connect uses a clockwise heading direction. the existing angle is counter-clockwise, so we need to invert it
     heading_deg = -heading_deg
@@ -217,7 +304,7 @@ def stream_transform_data(
         dx = x - previous_position[0]
         dy = y - previous_position[1]
         dz = z - previous_position[2]
-        ds = (dx**2 + dy**2 + dz**2) ** 0.5
+        ds = math.sqrt(dx * dx + dy * dy + dz * dz)
         speed = ds / dt
         client.stream(
             "drone_velocity",
@@ -233,6 +320,35 @@ def stream_transform_data(
     return [x, y, z]
 
 
+def quat_to_yxz_degrees(qx, qy, qz, qw):
+    """
+    Convert a quaternion to intrinsic YXZ Euler angles in degrees.
+
+    Equivalent to Rotation.from_quat([qx, qy, qz, qw]).as_euler("YXZ", degrees=True)
+    without allocating any arrays.
+
+    Args:
+        qx, qy, qz, qw: Quaternion components (need not be normalized)
+
+    Returns:
+        Tuple of (y, x, z) rotation angles in degrees
+    """
+    s = 2.0 / (qx * qx + qy * qy + qz * qz + qw * qw)
+
+    # Only the rotation matrix elements needed for the YXZ decomposition
+    r02 = s * (qx * qz + qw * qy)
+    r22 = 1.0 - s * (qx * qx + qy * qy)
+    r12 = s * (qy * qz - qw * qx)
+    r10 = s * (qx * qy + qw * qz)
+    r11 = 1.0 - s * (qx * qx + qz * qz)
+
+    y_angle = math.atan2(r02, r22)
+    x_angle = math.asin(max(-1.0, min(1.0, -r12)))
+    z_angle = math.atan2(r10, r11)
+
+    return math.degrees(y_angle), math.degrees(x_angle), math.degrees(z_angle)
+
+
 def convert_image_to_rgb(ros_image):
     """
     Convert a ROS Image message to RGB format for Connect streaming.
@@ -241,7 +357,7 @@ def convert_image_to_rgb(ros_image):
         ros_image: A ROS Image message
 
     Returns:
-        List of RGB pixel values suitable for client.stream_rgb
+        Flat uint8 array of interleaved RGB pixel values for client.stream_rgb
     """
     encoding = ros_image.encoding
 
@@ -252,17 +368,14 @@ def convert_image_to_rgb(ros_image):
     if is_16bit:
         # For 16-bit images
         mono_array = np.frombuffer(ros_image.data, dtype=np.uint16)
-        # Convert to 8-bit for RGB
-        mono_8bit = (mono_array / 256).astype(np.uint8)
+        # Convert to 8-bit for RGB by keeping the high byte
+        mono_8bit = (mono_array >> 8).astype(np.uint8)
     else:
         # For 8-bit images
         mono_8bit = np.frombuffer(ros_image.data, dtype=np.uint8)
 
-    # Convert grayscale to RGB using numpy broadcasting
-    rgb_array = np.stack((mono_8bit,) * 3, axis=-1).reshape(-1)
-
-    # Convert to list for connect_python
-    return rgb_array
+    # Convert grayscale to interleaved RGB in a single contiguous write
+    return np.repeat(mono_8bit, 3)
 
 
 if __name__ == "__main__":
@@ -1,3 +1,4 @@
+import threading
 import time
 import traceback
 
@@ -8,10 +9,39 @@ import nominal as nm
 from utils import (
     format_data_for_stream,
 )
-from labjack_utils import setup_labjack_device, configure_labjack_device
+from labjack_utils import (
+    setup_labjack_device,
+    configure_labjack_device,
+    names_to_addresses,
+)
 
 logger = connect_python.get_logger(__name__)
 
+# Seconds between refreshes of the app settings read by the streaming loop
+SETTINGS_POLL_INTERVAL = 0.5
+
+
+def poll_app_settings(
+    connect_client: connect_python.Client, settings: dict, running: threading.Event
+):
+    """
+    Refresh the run state and Nominal settings from the app in the background.
+
+    Keeps get_value round trips out of the eStreamRead loop, which reads the
+    latest values from `settings` and `running` instead.
+    """
+    while True:
+        settings["stream_to_nominal"] = bool(
+            connect_client.get_value("stream_to_nominal", False)
+        )
+        settings["tag_key"] = connect_client.get_value("tag_key")
+        settings["tag_value"] = connect_client.get_value("tag_value")
+        if connect_client.get_value("run_state") == "Running":
+            running.set()
+        else:
+            running.clear()
+        time.sleep(SETTINGS_POLL_INTERVAL)
+
 
 @connect_python.main
 def stream_data(connect_client: connect_python.Client):
@@ -53,7 +83,7 @@ def stream_data(connect_client: connect_python.Client):
         ]
         if c
     ]
-    aScanList = ljm.namesToAddresses(len(aScanListNames), aScanListNames)[0]
+    aScanList = names_to_addresses(tuple(aScanListNames))
     samples_per_read = int(sample_rate / 10)
     dt = 1 / sample_rate
 
@@ -78,8 +108,16 @@ def stream_data(connect_client: connect_python.Client):
     else:
         connect_client.set_value("Nominal Connection not found")
 
+    settings = {}
+    running = threading.Event()
+    threading.Thread(
+        target=poll_app_settings,
+        args=(connect_client, settings, running),
+        daemon=True,
+    ).start()
+
     while True:
-        if connect_client.get_value("run_state") == "Running":
+        if running.wait(0.1):
             # Set up the Nominal Streaming
             try:
                 # Start LabJack stream to ljm driver
@@ -92,10 +130,7 @@ def stream_data(connect_client: connect_python.Client):
                 )
                 connect_client.set_value("actual_sample_rate", scanRate)
 
-                while True:
-                    if connect_client.get_value("run_state") != "Running":
-                        break
-
+                while running.is_set():
                     # Fetch data from ljm driver
                     readings = ljm.eStreamRead(handle)
                     timestamp = time.time()
@@ -114,15 +149,18 @@ def stream_data(connect_client: connect_python.Client):
                     )
 
                     # Streaming to Nominal Core
-                    if bool(connect_client.get_value("stream_to_nominal", False)):
-                        nom_key = connect_client.get_value("tag_key")
-                        nom_value = connect_client.get_value("tag_value")
+                    if settings["stream_to_nominal"]:
+                        nom_key = settings["tag_key"]
+                        nom_value = settings["tag_value"]
+
+                        # Per-channel view of the same buffer; rows are channels
+                        values_by_channel = stream_args_per_channel["values"].T
 
                         for i, channel in enumerate(aScanListNames):
                             core_stream.enqueue_batch(
                                 channel_name=channel,
                                 timestamps=stream_args_per_channel["timestamps"],
-                                values=stream_args_per_channel["values"][i],
+                                values=values_by_channel[i],
                                 tags={nom_key: nom_value},
                             )
 
@@ -130,13 +168,12 @@ def stream_data(connect_client: connect_python.Client):
                 print(f"Error in stream_data: {e}", flush=True)
                 print("\nFull traceback:", flush=True)
                 print(traceback.format_exc(), flush=True)
+                running.clear()
                 connect_client.set_value("run_state", "Stopped")
             finally:
                 print("Stopping Acquisition...", flush=True)
                 ljm.eStreamStop(handle)
 
-        time.sleep(0.1)
-
 
 if __name__ == "__main__":
     stream_data()
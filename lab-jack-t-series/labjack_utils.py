@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from labjack import ljm
 
 
@@ -28,3 +30,9 @@ def configure_labjack_device(handle, info):
     numFrames = len(aNames)
     ljm.eWriteNames(handle, numFrames, aNames, aValues)
     return handle
+
+
+@lru_cache(maxsize=8)
+def names_to_addresses(names):
+    """Resolve a tuple of register names to Modbus addresses, caching the result"""
+    return ljm.namesToAddresses(len(names), list(names))[0]
@@ -1,9 +1,11 @@
 from typing import Union
 
+import numpy as np
+
 
 def format_data_for_stream(
     fetch: list[float], channel_names: list[str], t0: float, dt: float
-) -> dict[str, Union[list[float], list[list[float]], list[str]]]:
+) -> dict[str, Union[np.ndarray, list[str]]]:
     """Takes labjack data lists and channel names and creates a list of data for each computed timestamp
 
     Args:
@@ -15,8 +17,9 @@ def format_data_for_stream(
         dt (float): Period of time between datapoints in seconds
 
     Returns:
-        list[dict[str:float, str:list[float], str:list[str]]]: A list of dicts where every element is a single sample for all channels
-            for each dt.
+        dict[str, np.ndarray | list[str]]: "timestamps" is a 1D array of sample times, "values" is a
+            (samples_per_channel, channel_count) array where every row is a single sample for all
+            channels for each dt, and "names" is the channel names.
     """
     channel_count = len(channel_names)
     samples_per_channel = int(len(fetch) / channel_count)
@@ -38,24 +41,23 @@ def format_data_for_stream(
 
 def create_timestamps_from_dt(
     t0: float, dt: float, length: int, backstamp: bool = False
-) -> list[float]:
+) -> np.ndarray:
     if backstamp:
         t0 = t0 - dt * length
 
-    return [t0 + i * dt for i in range(length)]
+    return t0 + np.arange(length, dtype=np.float64) * dt
 
 
 def create_samples_by_timestamp(
     flat_data: list[float], channel_count: int, samples_per_channel: int
-) -> list[list[float]]:
-    return [
-        flat_data[i * channel_count : (i + 1) * channel_count]
-        for i in range(samples_per_channel)
-    ]
+) -> np.ndarray:
+    return np.asarray(flat_data, dtype=np.float64).reshape(
+        samples_per_channel, channel_count
+    )
 
 
 def create_samples_by_channel(
     flat_data: list[float],
     channel_count: int,
-) -> list[list[float]]:
-    return [flat_data[i::channel_count] for i in range(channel_count)]
+) -> np.ndarray:
+    return np.asarray(flat_data, dtype=np.float64).reshape(-1, channel_count).T
@@ -1,3 +1,4 @@
+import asyncio
 import numpy as np
 import sys
 from datetime import datetime, timezone
@@ -7,6 +8,103 @@ import connect_python
 
 log = connect_python.get_logger("multi-stream")
 
+# Prefixes cycled through when generating channel names
+CHANNEL_PREFIXES = (
+    "Alpha",
+    "Beta",
+    "Gamma",
+    "Delta",
+    "Epsilon",
+    "Zeta",
+    "Eta",
+    "Theta",
+    "Iota",
+    "Kappa",
+    "Lambda",
+    "Mu",
+    "Nu",
+    "Xi",
+    "Omicron",
+    "Pi",
+    "Rho",
+    "Sigma",
+    "Tau",
+    "Upsilon",
+    "Phi",
+    "Chi",
+    "Psi",
+    "Omega",
+)
+
+
+def generate_sines(channel_indices, phase, y_offset, out):
+    """
+    Write the sine value of every channel into `out`, where channel i oscillates
+    at i times the base phase. Works in place so no temporaries are allocated.
+    """
+    np.multiply(channel_indices, phase, out=out)
+    np.sin(out, out=out)
+    np.add(out, y_offset, out=out)
+    return out
+
+
+async def stream_sines(
+    client, channel_names, frequency, y_offset, delay, debug_logging
+):
+    """
+    Stream one sine value per channel every `delay` seconds.
+
+    Each tick's send runs on a worker thread and is only awaited at the start
+    of the next tick, so computing and pacing overlap with the previous send.
+    """
+    start_ns = time.monotonic_ns()
+    channel_indices = np.arange(len(channel_names), dtype=np.float64)
+    sines = np.empty_like(channel_indices)
+    # Keys are fixed for the run; values are overwritten in place every tick
+    channel_map = dict.fromkeys(channel_names, 0.0)
+    pending_send = None
+
+    deadline = time.perf_counter() + delay
+
+    try:
+        while True:
+            delta = (time.monotonic_ns() - start_ns) * 1e-9
+            t = datetime.fromtimestamp(time.time_ns() * 1e-9, timezone.utc)
+            floats = generate_sines(
+                channel_indices, delta * frequency, y_offset, sines
+            ).tolist()
+
+            # The previous send must finish before channel_map is reused
+            if pending_send is not None:
+                await pending_send
+
+            channel_map.update(zip(channel_names, floats))
+
+            pending_send = asyncio.create_task(
+                asyncio.to_thread(
+                    client.stream_from_dict,
+                    "sensors",
+                    timestamp=t,
+                    channel_map=channel_map,
+                )
+            )
+
+            if debug_logging:
+                print(f"Data size: {len(floats)}", flush=True)
+                print(f"\x1b[31mTimestamp: {t}\x1b[0m", flush=True, file=sys.stderr)
+
+            # Sleep until the next tick so processing time doesn't stretch the period.
+            # After an overrun, skip the missed ticks instead of bursting to catch up.
+            sleep_for = deadline - time.perf_counter()
+            if sleep_for > 0:
+                await asyncio.sleep(sleep_for)
+            elif delay > 0:
+                deadline += (-sleep_for // delay) * delay
+            deadline += delay
+    finally:
+        if pending_send is not None:
+            await pending_send
+
 
 @connect_python.main
 def stream_data(client: connect_python.Client):
@@ -37,30 +135,18 @@ def stream_data(client: connect_python.Client):
     try:
         client.clear_stream("sensors")
 
-        start = datetime.now(timezone.utc)
-
         # Generate channel names once before the loop
+        channel_ids = np.random.default_rng().integers(1, 99999, size=stream_count)
         channel_names = [
-            f"{['Alpha', 'Beta', 'Gamma', 'Delta', 'Epsilon', 'Zeta', 'Eta', 'Theta', 'Iota', 'Kappa', 'Lambda', 'Mu', 'Nu', 'Xi', 'Omicron', 'Pi', 'Rho', 'Sigma', 'Tau', 'Upsilon', 'Phi', 'Chi', 'Psi', 'Omega'][i % 24]}_{np.random.randint(1, 99999)}"
-            for i in range(stream_count)
+            f"{CHANNEL_PREFIXES[i % len(CHANNEL_PREFIXES)]}_{channel_id}"
+            for i, channel_id in enumerate(channel_ids.tolist())
         ]
 
-        while True:
-            t = datetime.now(timezone.utc)
-            delta = (t - start).total_seconds()
-            floats = [
-                np.sin(delta * frequency * i) + y_offset for i in range(stream_count)
-            ]
-
-            client.stream_from_dict(
-                "sensors", timestamp=t, channel_map=dict(zip(channel_names, floats))
+        asyncio.run(
+            stream_sines(
+                client, channel_names, frequency, y_offset, delay, debug_logging
             )
-
-            if debug_logging:
-                print(f"Data size: {len(floats)}", flush=True)
-                print(f"\x1b[31mTimestamp: {t}\x1b[0m", flush=True, file=sys.stderr)
-
-            time.sleep(delay)
+        )
 
     except Exception as e:
         print(f"Error in stream_data: {e}", flush=True)
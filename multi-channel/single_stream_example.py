@@ -1,9 +1,48 @@
+import asyncio
 import time
-from datetime import datetime, timezone
 import numpy as np
 import connect_python
 
 
+def send_values(client, t, value, delta):
+    client.stream("sine_wave", t, value)
+    client.stream("incrementing_value", t, delta)
+
+
+async def stream_sine(client, frequency, y_offset):
+    """
+    Stream the sine wave and elapsed time every 10 ms.
+
+    Each tick's sends run on a worker thread and are only awaited at the start
+    of the next tick, so computing and pacing overlap with the previous send.
+    """
+    period = 0.01
+    pending_send = None
+
+    start_ns = time.monotonic_ns()
+    deadline = time.perf_counter()
+    try:
+        while True:
+            t = time.time_ns() * 1e-9
+            delta = (time.monotonic_ns() - start_ns) * 1e-9
+            value = np.sin(delta * frequency) + y_offset
+
+            if pending_send is not None:
+                await pending_send
+            pending_send = asyncio.create_task(
+                asyncio.to_thread(send_values, client, t, value, delta)
+            )
+
+            # Sleep until the next tick so processing time doesn't stretch the period
+            deadline += period
+            sleep_for = deadline - time.perf_counter()
+            if sleep_for > 0:
+                await asyncio.sleep(sleep_for)
+    finally:
+        if pending_send is not None:
+            await pending_send
+
+
 @connect_python.main
 def stream_data(client: connect_python.Client):
     print("Starting single_stream_example.py", flush=True)
@@ -18,16 +57,7 @@ def stream_data(client: connect_python.Client):
         client.clear_stream("sine_wave")
         client.clear_stream("incrementing_value")
 
-        start = datetime.now(timezone.utc)
-        while True:
-            t = datetime.now(timezone.utc)
-            delta = (t - start).total_seconds()
-            value = np.sin(delta * frequency) + y_offset
-
-            client.stream("sine_wave", t, value)
-            client.stream("incrementing_value", t, delta)
-
-            time.sleep(0.01)  # Add a small delay
+        asyncio.run(stream_sine(client, frequency, y_offset))
     except Exception as e:
         print(f"Error in stream_data: {e}", flush=True)
 
@@ -1,5 +1,6 @@
 import time
 import random
+from functools import lru_cache
 import yaml
 from pathlib import Path
 import connect_python
@@ -20,14 +21,7 @@ def temperature_units(units):
     """
     from nidaqmx.constants import TemperatureUnits
 
-    if units == "DEG_C":
-        return TemperatureUnits.DEG_C
-    elif units == "DEG_F":
-        return TemperatureUnits.DEG_F
-    elif units == "K":
-        return TemperatureUnits.K
-    elif units == "DEG_R":
-        return TemperatureUnits.DEG_R
+    return TemperatureUnits[units]
 
 
 def tc_conversion(thermocouple_type):
@@ -46,107 +40,125 @@ def tc_conversion(thermocouple_type):
     """
     from nidaqmx.constants import ThermocoupleType
 
-    if thermocouple_type == "K":
-        thermocouple_type = ThermocoupleType.K
-    elif thermocouple_type == "J":
-        thermocouple_type = ThermocoupleType.J
-    elif thermocouple_type == "T":
-        thermocouple_type = ThermocoupleType.T
-    elif thermocouple_type == "E":
-        thermocouple_type = ThermocoupleType.E
-    elif thermocouple_type == "N":
-        thermocouple_type = ThermocoupleType.N
-    elif thermocouple_type == "R":
-        thermocouple_type = ThermocoupleType.R
-    elif thermocouple_type == "S":
-        thermocouple_type = ThermocoupleType.S
-    elif thermocouple_type == "B":
-        thermocouple_type = ThermocoupleType.B
-    elif thermocouple_type == "C":
-        thermocouple_type = ThermocoupleType.C
-
-    return thermocouple_type
-
-
-def read_analog_input(
-    ch, min_voltage, max_voltage, card_type, thermocouple_type, mock_data
-):
+    return ThermocoupleType[thermocouple_type]
+
+
+# Readings are buffered and sent together once either limit is reached
+STREAM_BATCH_SIZE = 10
+STREAM_BATCH_LATENCY = 0.25  # seconds
+
+# Finite acquisition captured from every channel on each read
+SAMPLE_RATE_HZ = 100000  # 100kHz
+SAMPLES_PER_CHANNEL = 2  # Quick capture of 2 samples per channel
+
+
+@lru_cache(maxsize=1)
+def load_channel_config():
+    """
+    Parse channels.yml once and return the per-channel configuration.
+
+    Returns
+    -------
+    dict or None
+        Mapping of channel identifiers to their settings, or None if there is no file.
+    """
+    yaml_path = Path(__file__).parent / "channels.yml"
+    if not yaml_path.exists():
+        return None
+    with open(yaml_path, "r") as f:
+        return yaml.safe_load(f)
+
+
+def channel_settings(ch, min_voltage, max_voltage, card_type, thermocouple_type):
     """
-    Read a single analog input channel and return the measurement result.
+    Resolve the acquisition settings of a channel, applying channels.yml overrides.
 
     Parameters
     ----------
     ch : str
         Channel identifier (e.g., 'cDAQ1Mod1/ai0').
     min_voltage : float
-        Minimum voltage range for the measurement.
+        Default minimum voltage range for the measurement.
     max_voltage : float
-        Maximum voltage range for the measurement.
+        Default maximum voltage range for the measurement.
     card_type : str
-        Type of card ('TC' for thermocouple, 'mV' for millivolt, or 'mA' for current).
+        Default type of card ('TC' for thermocouple, 'mV' for millivolt, or 'mA' for current).
     thermocouple_type : str
-        Type of thermocouple if using TC card type.
-    mock_data : bool
-        If True, generate random data instead of reading from hardware.
+        Default type of thermocouple if using TC card type.
 
     Returns
     -------
-    list or float
-        Measurement data from the channel. Returns a list of samples for real hardware
-        or a single float value for mock data.
+    tuple
+        (min_voltage, max_voltage, card_type, thermocouple_type, units) for the channel.
     """
     # Load channel-specific configuration if available
     try:
-        yaml_path = Path(__file__).parent / "channels.yml"
-        if yaml_path.exists():
-            with open(yaml_path, "r") as f:
-                channel_config = yaml.safe_load(f)
-            if ch in channel_config:
-                cfg = channel_config[ch]
-                try:
-                    min_voltage = float(cfg.get("min_val", min_voltage))
-                    max_voltage = float(cfg.get("max_val", max_voltage))
-                except ValueError as e:
-                    logger.error(f"Invalid voltage values in config: {e}")
-                if "thermocouple_type" in cfg:
-                    if cfg["thermocouple_type"] in [
-                        "K",
-                        "J",
-                        "T",
-                        "E",
-                        "N",
-                        "R",
-                        "S",
-                        "B",
-                        "C",
-                    ]:
-                        thermocouple_type = cfg["thermocouple_type"]
-                    else:
-                        logger.error(
-                            f"Invalid thermocouple type: {cfg['thermocouple_type']}"
-                        )
-                if "card_type" in cfg:
-                    if (
-                        cfg["card_type"] == "TC"
-                        or cfg["card_type"] == "mV"
-                        or cfg["card_type"] == "mA"
-                    ):
-                        card_type = cfg["card_type"]
-                    else:
-                        logger.error(f"Invalid card type: {cfg['card_type']}")
-                units = cfg.get("units", "DEG_C")
+        channel_config = load_channel_config()
+        if channel_config and ch in channel_config:
+            cfg = channel_config[ch]
+            try:
+                min_voltage = float(cfg.get("min_val", min_voltage))
+                max_voltage = float(cfg.get("max_val", max_voltage))
+            except ValueError as e:
+                logger.error(f"Invalid voltage values in config: {e}")
+            if "thermocouple_type" in cfg:
+                if cfg["thermocouple_type"] in [
+                    "K",
+                    "J",
+                    "T",
+                    "E",
+                    "N",
+                    "R",
+                    "S",
+                    "B",
+                    "C",
+                ]:
+                    thermocouple_type = cfg["thermocouple_type"]
+                else:
+                    logger.error(
+                        f"Invalid thermocouple type: {cfg['thermocouple_type']}"
+                    )
+            if "card_type" in cfg:
+                if (
+                    cfg["card_type"] == "TC"
+                    or cfg["card_type"] == "mV"
+                    or cfg["card_type"] == "mA"
+                ):
+                    card_type = cfg["card_type"]
+                else:
+                    logger.error(f"Invalid card type: {cfg['card_type']}")
+            units = cfg.get("units", "DEG_C")
     except Exception as e:
         logger.error(f"Error loading channel configuration: {e}")
         units = "DEG_C"
     else:
         units = "DEG_C"
 
-    if not mock_data:
-        import nidaqmx
-        from nidaqmx.constants import AcquisitionType
+    return min_voltage, max_voltage, card_type, thermocouple_type, units
 
-        with nidaqmx.Task() as task:
-            # Create an analog input voltage channel (adjust the parameters as needed)
+
+def create_analog_input_task(settings_by_channel):
+    """
+    Create one NI-DAQmx task that acquires all channels on a shared sample clock.
+
+    Parameters
+    ----------
+    settings_by_channel : dict
+        Mapping of channel identifiers to the settings tuple returned by
+        channel_settings.
+
+    Returns
+    -------
+    nidaqmx.Task
+        The configured task. The caller is responsible for closing it.
+    """
+    import nidaqmx
+    from nidaqmx.constants import AcquisitionType
+
+    task = nidaqmx.Task()
+    try:
+        for ch, settings in settings_by_channel.items():
+            min_voltage, max_voltage, card_type, thermocouple_type, units = settings
 
             logger.warning(f"Channel: {ch}")
             logger.warning(f"Card type: {card_type}")
@@ -175,32 +187,73 @@ def read_analog_input(
                     max_val=max_voltage,
                 )
 
-            # Configure the sampling rate and number of samples to acquire
-            sample_rate_hz = 100000  # 10kHz
-            samples_per_channel = (
-                2  # Quick 1ms capture of 2 samples per channel at 10k Hz
-            )
+        # Configure the sampling rate and number of samples to acquire
+        task.timing.cfg_samp_clk_timing(
+            SAMPLE_RATE_HZ,
+            sample_mode=AcquisitionType.FINITE,
+            samps_per_chan=SAMPLES_PER_CHANNEL,
+        )
+    except Exception:
+        task.close()
+        raise
 
-            task.timing.cfg_samp_clk_timing(
-                sample_rate_hz,
-                sample_mode=AcquisitionType.FINITE,
-                samps_per_chan=samples_per_channel,
-            )
+    return task
 
-            data = task.read(number_of_samples_per_channel=samples_per_channel)
-    else:
-        if card_type == "mV":
-            mean = (max_voltage + min_voltage) / 2
-            std_dev = (max_voltage - min_voltage) / 6  # 99.7% of values within range
-            data = [random.gauss(mean, std_dev)]
-        elif card_type == "TC" or card_type == "mA":
-            mean = 21.0  # center of 19-23 range
-            std_dev = 0.67  # 99.7% of values within ±2V range
-            data = [random.gauss(mean, std_dev)]
 
-    print("Data", data, flush=True)
+def read_analog_inputs(task, channel_count):
+    """
+    Acquire one finite block from every channel of the task in a single read.
+
+    Parameters
+    ----------
+    task : nidaqmx.Task
+        Task created by create_analog_input_task.
+    channel_count : int
+        Number of channels in the task.
+
+    Returns
+    -------
+    list of float
+        The first sample of each channel, in channel order.
+    """
+    task.start()
+    try:
+        data = task.read(number_of_samples_per_channel=SAMPLES_PER_CHANNEL)
+    finally:
+        task.stop()
+
+    # nidaqmx only nests the samples per channel when there is more than one
+    if channel_count == 1:
+        data = [data]
+
+    return [samples[0] for samples in data]
 
-    return data
+
+def read_mock_input(min_voltage, max_voltage, card_type):
+    """
+    Generate a random reading for a channel instead of reading from hardware.
+
+    Parameters
+    ----------
+    min_voltage : float
+        Minimum voltage range for the measurement.
+    max_voltage : float
+        Maximum voltage range for the measurement.
+    card_type : str
+        Type of card ('TC' for thermocouple, 'mV' for millivolt, or 'mA' for current).
+
+    Returns
+    -------
+    float
+        A single mock measurement.
+    """
+    if card_type == "mV":
+        mean = (max_voltage + min_voltage) / 2
+        std_dev = (max_voltage - min_voltage) / 6  # 99.7% of values within range
+    else:
+        mean = 21.0  # center of 19-23 range
+        std_dev = 0.67  # 99.7% of values within ±2V range
+    return random.gauss(mean, std_dev)
 
 
 def get_channel_list(values):
@@ -285,25 +338,57 @@ def stream_data(client: connect_python.Client):
 
     client.clear_stream("sensors")
 
-    while True:
-        t = time.time()
-        single_voltage_readings = []
-        for i in range(len(channel_names)):
-            ch = channel_names[i]
-            card_type = card_type_by_channel[ch]
-            voltage = read_analog_input(
-                ch,
-                min_voltage,
-                max_voltage,
-                card_type,
-                thermocouple_type,
-                mock_data,
-            )
-            single_voltage_readings.append(voltage[0])
+    settings_by_channel = {
+        ch: channel_settings(
+            ch,
+            min_voltage,
+            max_voltage,
+            card_type_by_channel[ch],
+            thermocouple_type,
+        )
+        for ch in channel_names
+    }
+
+    # Acquire all channels through one task instead of one task per channel per read
+    task = None if mock_data else create_analog_input_task(settings_by_channel)
 
-        client.stream("sensors", t, values=single_voltage_readings, names=channel_names)
+    batch_timestamps = []
+    batch_values = []
+    batch_started = 0.0
+
+    try:
+        while True:
+            t = time.time()
+            if task is None:
+                single_voltage_readings = [
+                    read_mock_input(*settings_by_channel[ch][:3])
+                    for ch in channel_names
+                ]
+            else:
+                single_voltage_readings = read_analog_inputs(task, len(channel_names))
+
+            if not batch_timestamps:
+                batch_started = time.monotonic()
+            batch_timestamps.append(t)
+            batch_values.append(single_voltage_readings)
+
+            if (
+                len(batch_timestamps) >= STREAM_BATCH_SIZE
+                or time.monotonic() - batch_started >= STREAM_BATCH_LATENCY
+            ):
+                client.stream_batch(
+                    "sensors",
+                    timestamps=batch_timestamps,
+                    names=channel_names,
+                    values=batch_values,
+                )
+                batch_timestamps = []
+                batch_values = []
 
-        time.sleep(interval_seconds)
+            time.sleep(interval_seconds)
+    finally:
+        if task is not None:
+            task.close()
 
 
 if __name__ == "__main__":
@@ -1,7 +1,8 @@
+from functools import lru_cache
+
 import nidaqmx
 from nidaqmx.constants import AcquisitionType
 import numpy as np
-import matplotlib.pyplot as plt
 
 
 def read_analog_input(channel, sample_rate, num_samples):
@@ -22,9 +23,20 @@ def read_analog_input(channel, sample_rate, num_samples):
         return np.array(data)
 
 
+@lru_cache(maxsize=8)
+def time_axis(sample_rate, num_samples):
+    # Build the time array once per (sample_rate, num_samples); read-only since it is shared
+    time_array = np.arange(num_samples) / sample_rate
+    time_array.flags.writeable = False
+    return time_array
+
+
 def plot_data(data, sample_rate):
+    # Import pyplot only when plotting, it is the slowest import in this script
+    import matplotlib.pyplot as plt
+
     # Create time array
-    time_array = np.arange(len(data)) / sample_rate
+    time_array = time_axis(sample_rate, len(data))
 
     # Plot the acquired data
     plt.figure(figsize=(10, 6))
@@ -1,8 +1,13 @@
 import time
+import numpy as np
 import polars as pl
 import os
 import connect_python
 
+# Rows sent per stream_batch call; rows are paced 0.05 s apart
+STREAM_BATCH_SIZE = 5
+ROW_PERIOD = 0.05
+
 
 @connect_python.main
 def stream_data(client: connect_python.Client):
@@ -20,13 +25,18 @@ def stream_data(client: connect_python.Client):
     initial_lat = df["OSD.latitude"][0]
     initial_lon = df["OSD.longitude"][0]
 
-    # Calculate relative positions using polars expressions
-    df = df.with_columns(
+    # Compute every streamed column up front as one (rows, 6) array
+    position_rows = np.column_stack(
         [
-            (pl.col("OSD.latitude") - initial_lat).alias("latitude"),
-            (pl.col("OSD.longitude") - initial_lon).alias("longitude"),
+            (df["OSD.latitude"] - initial_lat).to_numpy() * 10_000.0,
+            (df["OSD.longitude"] - initial_lon).to_numpy() * 10_000.0,
+            df["OSD.height [ft]"].to_numpy() / 10.0,
+            df["OSD.pitch"].to_numpy(),
+            df["OSD.roll"].to_numpy(),
+            df["OSD.yaw"].to_numpy() + 90.0,  # Reference north, not east
         ]
-    )
+    ).astype(np.float64).tolist()
+    base_timestamps = df["timestamps_ns"].to_numpy().astype(np.float64)
 
     delta_ts = df["timestamps_ns"].max() - df["timestamps_ns"].min() + 1
     print(f"Delta time: {delta_ts}", flush=True)
@@ -35,26 +45,22 @@ def stream_data(client: connect_python.Client):
 
         iteration = 0
         while True:  # Add continuous loop
-            # Stream each row of the dataframe
-            for row in df.iter_rows(named=True):
-                timestamp = float(row["timestamps_ns"] + delta_ts * iteration)
+            # Shift the whole timestamp column once per replay
+            timestamps = (base_timestamps + delta_ts * iteration).tolist()
+
+            # Stream the dataframe a few rows at a time
+            for start in range(0, len(timestamps), STREAM_BATCH_SIZE):
+                end = start + STREAM_BATCH_SIZE
 
                 # Stream flight position data
-                client.stream(
+                client.stream_batch(
                     "drone_position",
-                    timestamp,
+                    timestamps=timestamps[start:end],
                     names=["x", "z", "y", "pitch", "roll", "heading"],
-                    values=[
-                        float(row["latitude"] * 10_000.0),
-                        float(row["longitude"] * 10_000.0),
-                        float(row["OSD.height [ft]"] / 10.0),
-                        float(row["OSD.pitch"]),
-                        float(row["OSD.roll"]),
-                        90 + float(row["OSD.yaw"]),  # Reference north, not east
-                    ],
+                    values=position_rows[start:end],
                 )
 
-                time.sleep(0.05)  # Add a small delay
+                time.sleep(ROW_PERIOD * STREAM_BATCH_SIZE)
 
             iteration += 1
             # Optional: Add a small delay between replays
@@ -54,8 +54,21 @@ JOINT_MULTIPLIERS = {
     6: 1.0,  # wrist_3_joint
 }
 
+# (offset, home, radians-per-tick) per motor in MOTOR_IDS order, flattened from
+# the dicts above once so the read loop indexes tuples instead of dicts
+_JOINT_CALIBRATION = tuple(
+    (
+        JOINT_ENCODER_OFFSETS[motor_id],
+        HOME_POSITIONS[motor_id],
+        TWO_PI / ENCODER_MAX * JOINT_MULTIPLIERS[motor_id],
+    )
+    for motor_id in MOTOR_IDS
+)
+
 # Feetech Protocol
 SCS_READ = 0x02
+SCS_SYNC_READ = 0x82
+SCS_BROADCAST_ID = 0xFE
 SCS_PRESENT_POSITION_L = 56
 
 logger = connect_python.get_logger(__name__)
@@ -74,7 +87,6 @@ def read_motor_register(ser, motor_id, register_address, num_bytes=2):
     packet = bytes(packet_without_checksum + [calculate_checksum(packet_without_checksum)])
     
     ser.write(packet)
-    time.sleep(0.001)
     response = ser.read(5 + num_bytes + 1)
     
     if len(response) >= (5 + num_bytes) and response[0] == 0xFF and response[1] == 0xFF:
@@ -90,33 +102,57 @@ def get_motor_position(ser, motor_id):
     return read_motor_register(ser, motor_id, SCS_PRESENT_POSITION_L, 2)
 
 
-def encoder_to_radians(encoder_value, home_position, motor_id):
+def sync_read_positions(ser, motor_ids=MOTOR_IDS):
     """
-    Convert encoder position (0-4095) to radians relative to home.
-    Centers the range around home position and applies offset/multiplier.
+    Read present position of several motors with a single SYNC_READ request.
+    Returns positions in motor_ids order, with None for motors that didn't reply.
     """
-    # Apply encoder offset first (before any conversion)
-    adjusted_encoder = encoder_value + JOINT_ENCODER_OFFSETS[motor_id]
-    
-    # Wrap to 0-4095 range
-    adjusted_encoder = adjusted_encoder % ENCODER_MAX
-    
-    # Calculate offset from home
-    offset = adjusted_encoder - home_position
-    
-    # Wrap to -2048 to +2047 range
-    if offset > ENCODER_MAX / 2:
-        offset -= ENCODER_MAX
-    elif offset < -ENCODER_MAX / 2:
-        offset += ENCODER_MAX
-    
-    # Convert to radians: offset / max_range * 2π
-    radians = (offset / ENCODER_MAX) * TWO_PI
-    
-    # Apply multiplier (for direction inversion)
-    radians = radians * JOINT_MULTIPLIERS[motor_id]
-    
-    return radians
+    num_bytes = 2
+    packet_without_checksum = [
+        0xFF, 0xFF, SCS_BROADCAST_ID, len(motor_ids) + 4, SCS_SYNC_READ,
+        SCS_PRESENT_POSITION_L, num_bytes, *motor_ids
+    ]
+    packet = bytes(packet_without_checksum + [calculate_checksum(packet_without_checksum)])
+
+    ser.reset_input_buffer()  # Drop a late reply from a timed-out read so it can't pass as this one
+    ser.write(packet)
+    # Every motor answers with its own status packet: FF FF id len err data... checksum
+    reply_size = 6 + num_bytes
+    response = ser.read(len(motor_ids) * reply_size)
+
+    positions = dict.fromkeys(motor_ids)
+    i = 0
+    while i + reply_size <= len(response):
+        if (response[i] == 0xFF and response[i + 1] == 0xFF and response[i + 3] == num_bytes + 2
+                and response[i + 2] in positions):
+            positions[response[i + 2]] = response[i + 5] | (response[i + 6] << 8)
+            i += reply_size
+        else:
+            i += 1
+    return [positions[motor_id] for motor_id in motor_ids]
+
+
+def encoders_to_radians(encoder_values):
+    """
+    Convert encoder positions (0-4095), one per motor in MOTOR_IDS order, to
+    radians relative to home. Centers each range around its home position and
+    applies offset/multiplier. Missing readings (None) map to 0.0 radians.
+    """
+    half_range = ENCODER_MAX / 2
+    angles = []
+    for (encoder_offset, home, scale), encoder_value in zip(
+        _JOINT_CALIBRATION, encoder_values
+    ):
+        if encoder_value is None:
+            angles.append(0.0)
+            continue
+        offset = (encoder_value + encoder_offset) % ENCODER_MAX - home
+        if offset > half_range:
+            offset -= ENCODER_MAX
+        elif offset < -half_range:
+            offset += ENCODER_MAX
+        angles.append(offset * scale)
+    return angles
 
 
 @connect_python.main
@@ -165,20 +201,10 @@ def main(connect_client: connect_python.Client):
         while True:
             timestamp = time.time()
             
-            # Read all motor positions
-            motor_positions = []
-            joint_angles = []
-            
-            for motor_id in MOTOR_IDS:
-                pos = get_motor_position(ser, motor_id)
-                if pos is not None:
-                    motor_positions.append(pos)
-                    # Convert to radians with offset and multiplier
-                    angle = encoder_to_radians(pos, HOME_POSITIONS[motor_id], motor_id)
-                    joint_angles.append(angle)
-                else:
-                    motor_positions.append(0)
-                    joint_angles.append(0.0)
+            # Read all motor positions, then convert them in one batch
+            raw_positions = sync_read_positions(ser)
+            joint_angles = encoders_to_radians(raw_positions)
+            motor_positions = [0 if pos is None else pos for pos in raw_positions]
             
             # Stream joint angles for URDF visualization
             connect_client.stream(
@@ -3,6 +3,8 @@
 
 import serial
 import time
+import queue
+import threading
 import connect_python
 import cv2
 import numpy as np
@@ -35,6 +37,11 @@ def initialize_camera(camera_index, width, height):
         cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
         cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
         cap.set(cv2.CAP_PROP_FPS, TARGET_FPS)
+        # ask for mjpg: the camera compresses frames itself, which uses far less
+        # usb bandwidth than raw yuyv (matters when two cameras share a bus)
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+        # keep at most one frame queued in the driver so we never read an old one
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
 
         # would be good to verify actual resolution and log it
         return cap
@@ -44,8 +51,33 @@ def initialize_camera(camera_index, width, height):
         return None
 
 
+def capture_frames(cap, camera_index, frames, stop_event):
+    # runs on its own thread, so waiting on the camera overlaps with
+    # converting and streaming the previous frame on the main thread
+    # (opencv releases the GIL while it waits for the camera)
+    while not stop_event.is_set():
+        # grab() takes the next frame from the camera without decoding it
+        if not cap.grab():
+            logger.warning(f"Failed to read from camera {camera_index}")
+            continue
+        timestamp = time.time()
+        # if the main loop hasn't picked up the last frame yet, skip this one
+        # instead of paying to decode a frame nobody will stream
+        if frames.full():
+            continue
+        # retrieve() decodes the grabbed frame
+        ret, frame = cap.retrieve()
+        if not ret:
+            logger.warning(f"Failed to decode frame from camera {camera_index}")
+            continue
+        frames.put_nowait((timestamp, frame))
+
+
 @connect_python.main
 def template_main(connect_client: connect_python.Client):
+    cap1 = cap2 = None
+    stop_event = threading.Event()
+    capture_threads = []
     try:
         logger.info(f"Initialize cameras...")
         cap1 = initialize_camera(CAMERA_1_INDEX, FRAME_WIDTH, FRAME_HEIGHT)
@@ -57,29 +89,54 @@ def template_main(connect_client: connect_python.Client):
         
         # should check invidividually and log which cam has the issue
 
+        # start one capture thread per camera
+        # each one hands its latest frame to the main loop through a queue of size 1
+        camera_streams = []     # (stream name, camera index, frame queue)
+        for stream_name, camera_index, cap in [
+            ("camera_1", CAMERA_1_INDEX, cap1),
+            ("camera_2", CAMERA_2_INDEX, cap2),
+        ]:
+            if cap is None:
+                continue
+            frames = queue.Queue(maxsize=1)
+            thread = threading.Thread(
+                target=capture_frames,
+                args=(cap, camera_index, frames, stop_event),
+                daemon=True,
+            )
+            thread.start()
+            camera_streams.append((stream_name, camera_index, frames))
+            capture_threads.append(thread)
+
+        # one reusable rgb buffer per camera, so we don't allocate a new frame every loop
+        rgb_buffers = {}
+
         logger.info("Starting camera streaming loop...")
         frame_count = 0     # for logging frequency
         start_time = time.time()
 
         while True:
-            timestamp = time.time()
-            # check if cam1 is available
-            # if it is, then read frame
-            if cap1 is not None:    # 
-                ret1, frame1 = cap1.read()
-                # if read was successful, then ret1=True
-                if ret1:
-                    # convert to rgb, then flatten
-                    frame1_rgb = cv2.cvtColor(frame1, cv2.COLOR_BGR2RGB)
-                    rgb_data = frame1_rgb.flatten()
-                    # stream the flattened image
-                    # camera_1 is the channel name, which we use in the app yaml
-                    # frame1.shape[1] is the image width, used with the flattened data
-                    # the connect api handles height from data length / width
-                    connect_client.stream_rgb("camera_1", timestamp, frame1.shape[1], rgb_data)
-                else:
-                    logger.warning(f"Failed to read from camera {CAMERA_1_INDEX}")
-            # do the same for cap2
+            for stream_name, camera_index, frames in camera_streams:
+                # wait for this camera's next frame
+                try:
+                    timestamp, frame = frames.get(timeout=1.0)
+                except queue.Empty:
+                    logger.warning(f"No new frame from camera {camera_index}")
+                    continue
+                # (re)allocate the buffer the first time, or if the frame size changes
+                rgb_buffer = rgb_buffers.get(stream_name)
+                if rgb_buffer is None or rgb_buffer.shape != frame.shape:
+                    rgb_buffer = rgb_buffers[stream_name] = np.empty_like(frame)
+                # convert to rgb with a single copy into the reused buffer:
+                # frame[..., ::-1] is a view with the channel order reversed (bgr -> rgb)
+                np.copyto(rgb_buffer, frame[..., ::-1])
+                # the buffer is contiguous, so ravel() flattens it without copying
+                rgb_data = rgb_buffer.ravel()
+                # stream the flattened image
+                # stream_name is the channel name, which we use in the app yaml
+                # frame.shape[1] is the image width, used with the flattened data
+                # the connect api handles height from data length / width
+                connect_client.stream_rgb(stream_name, timestamp, frame.shape[1], rgb_data)
 
     # makes it possible to use control+c
     except KeyboardInterrupt:
@@ -90,9 +147,16 @@ def template_main(connect_client: connect_python.Client):
         logger.error(traceback.format_exc())
 
     finally:
+        # stop the capture threads before releasing the cameras they read from
+        stop_event.set()
+        for thread in capture_threads:
+            thread.join(timeout=1.0)
         if cap1 is not None:
             cap1.release()
             logger.info(f"Released camera {CAMERA_1_INDEX}")
+        if cap2 is not None:
+            cap2.release()
+            logger.info(f"Released camera {CAMERA_2_INDEX}")
         # clean up resources if needed
         cv2.destroyAllWindows()
 
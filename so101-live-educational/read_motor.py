@@ -15,6 +15,8 @@ SAMPLE_RATE = 50  # target sample rate in Hz, 2ms + overhead
 # Feetech Protocol Constants
 SCS_READ = 0x02                 # Read command instruction
 SCS_PRESENT_POSITION_L = 56     # Register address for position (lower byte)
+SCS_SYNC_READ = 0x82            # Sync read instruction, one request for many motors
+SCS_BROADCAST_ID = 0xFE         # Broadcast ID, every motor listens
 
 # use connect logger instead of print statements
 logger = connect_python.get_logger(__name__)
@@ -36,6 +38,55 @@ def get_motor_position(ser, motor_id):
         2                              # Number of bytes to read (16-bit position)
     ]
 
+def calculate_checksum(packet):
+    # checksum is the inverted sum of everything after the two header bytes
+    return ~sum(packet[2:]) & 0xFF
+
+def get_all_motor_positions(ser, motor_ids):
+    # same idea as get_motor_position, but one SYNC_READ asks every motor at once
+    # so the bus turns around once per loop instead of once per motor
+
+    # CONSTRUCT SYNC READ COMMAND PACKET
+    # Format: [0xFF, 0xFF, 0xFE, Length, 0x82, Address, ReadLength, ID1, ID2, ..., Checksum]
+    length = len(motor_ids) + 4  # Instruction + Address + ReadLength + IDs + Checksum
+    packet_without_checksum = [
+        0xFF, 0xFF,                    # Header bytes
+        SCS_BROADCAST_ID,              # Broadcast, every listed motor answers
+        length,                        # Packet length
+        SCS_SYNC_READ,                 # Sync read instruction
+        SCS_PRESENT_POSITION_L,        # Position register address
+        2,                             # Number of bytes to read (16-bit position)
+        *motor_ids                     # Motors to answer, in this order
+    ]
+    packet = bytes(packet_without_checksum + [calculate_checksum(packet_without_checksum)])
+
+    # clear stray bytes first so they can't shift the replies
+    ser.reset_input_buffer()
+    ser.write(packet)
+
+    # each motor sends back its own 8-byte status packet
+    # Format: [0xFF, 0xFF, ID, Length, Error, PosL, PosH, Checksum]
+    response = ser.read(8 * len(motor_ids))
+
+    # motors that didn't answer stay None
+    positions = dict.fromkeys(motor_ids)
+    i = 0
+    while i + 8 <= len(response):
+        if response[i] == 0xFF and response[i + 1] == 0xFF and response[i + 2] in positions:
+            positions[response[i + 2]] = response[i + 5] | (response[i + 6] << 8)
+            i += 8
+        else:
+            i += 1  # not a header, slide forward one byte
+    return positions
+
+def precise_sleep_until(deadline):
+    # time.sleep can overshoot by a scheduler tick, so sleep until 1 ms before
+    # the deadline and spin out the last millisecond on perf_counter
+    while (remaining := deadline - time.perf_counter()) > 0.001:
+        time.sleep(remaining - 0.001)
+    while time.perf_counter() < deadline:
+        pass
+
 #
 @connect_python.main
 def main(connect_client: connect_python.Client):
@@ -53,14 +104,16 @@ def main(connect_client: connect_python.Client):
 
     # main acquisition loop
     logger.info("starting main acquisition loop")
+    period = 1.0 / SAMPLE_RATE
+    next_deadline = time.perf_counter()
     while True:
         timestamp = time.time()
 
         # get motor positions and put into a dictionary
+        # one sync read replaces calling get_motor_position for each motor
         positions = {}
-        for motor_id in MOTOR_IDS:
-            # get position and generate key name
-            position = get_motor_position(ser, motor_id)
+        for motor_id, position in get_all_motor_positions(ser, MOTOR_IDS).items():
+            # generate key name
             motor_name = f"motor_{motor_id}"
             # store position in a dictionary
             positions[motor_name] = position
@@ -91,7 +144,13 @@ def main(connect_client: connect_python.Client):
         else:
             logger.warning("No valid motor positions read in this loop")
         
-        time.sleep(1.0 / SAMPLE_RATE)
+        # sleep until the next deadline on a fixed grid, so the time spent
+        # reading and streaming doesn't stretch the loop period
+        next_deadline += period
+        if next_deadline > time.perf_counter():
+            precise_sleep_until(next_deadline)
+        else:
+            next_deadline = time.perf_counter()  # fell behind, resync instead of bursting
 
 
 if __name__ == "__main__":
@@ -9,7 +9,10 @@ Hardware: SO-101 Robot with Feetech servo motors (Arm 2)
 Protocol: Feetech SCS (Serial Command System)
 """
 
+import os
+import select
 import serial
+import threading
 import time
 import traceback
 import connect_python
@@ -20,9 +23,14 @@ BAUD_RATE = 1_000_000          # Communication speed (1 Mbps)
 MOTOR_IDS = [1, 2, 3, 4, 5, 6] # IDs of motors to monitor
 TIMEOUT = 0.05                  # Serial read timeout in seconds
 SAMPLE_RATE = 50                # Target sampling rate in Hz
+CHANNEL_NAMES = [f"motor_{motor_id}" for motor_id in MOTOR_IDS]  # Stream channel per motor
+DEADBAND = 2                    # Only stream a motor once it moves this many ticks (~0.18 deg)
+HEARTBEAT_INTERVAL = 1.0        # Stream every motor at least this often (seconds)
 
 # Feetech Protocol Constants
 SCS_READ = 0x02                 # Read command instruction
+SCS_SYNC_READ = 0x82            # Sync read (many motors, one request)
+SCS_BROADCAST_ID = 0xFE         # Broadcast ID used by sync instructions
 SCS_PRESENT_POSITION_L = 56     # Register address for position (lower byte)
 
 logger = connect_python.get_logger(__name__)
@@ -33,27 +41,26 @@ def calculate_checksum(packet):
     Calculate the checksum for a Feetech SCS protocol packet.
     
     Args:
-        packet: List of bytes representing the packet (without checksum)
+        packet: List, bytes or bytearray of the packet (without checksum)
         
     Returns:
         Checksum byte (inverted sum of ID through parameters)
     """
-    total = sum(packet[2:])  # Sum from ID onwards (skip two 0xFF headers)
+    # Sum from ID onwards: subtract the two 0xFF headers rather than slicing a copy
+    total = sum(packet) - packet[0] - packet[1]
     return ~total & 0xFF
 
 
-def get_motor_position(ser, motor_id):
+def build_read_position_packet(motor_id):
     """
-    Read the current position from a Feetech servo motor.
+    Build the read command packet for one motor's present position.
     
     Args:
-        ser: Serial connection object
         motor_id: Motor ID to query (1-6)
         
     Returns:
-        Motor position as integer (0-4095), or None if read fails
+        Complete packet as bytes, checksum included
     """
-    # Construct read command packet
     # Format: [0xFF, 0xFF, ID, Length, Instruction, Address, ReadLength, Checksum]
     length = 4  # Instruction + Address + ReadLength + Checksum
     packet_without_checksum = [
@@ -66,27 +73,223 @@ def get_motor_position(ser, motor_id):
     ]
     
     checksum = calculate_checksum(packet_without_checksum)
-    packet = bytes(packet_without_checksum + [checksum])
+    return bytes(packet_without_checksum + [checksum])
+
+
+def build_sync_read_positions_packet(motor_ids):
+    """
+    Build the SYNC_READ packet asking several motors for their present position.
+    
+    Args:
+        motor_ids: Motor IDs that should answer, in order
+        
+    Returns:
+        Complete packet as bytes, checksum included
+    """
+    # Format: [0xFF, 0xFF, 0xFE, Length, SyncRead, Address, ReadLength, ID1..IDn, Checksum]
+    packet_without_checksum = [
+        0xFF, 0xFF,                    # Header bytes
+        SCS_BROADCAST_ID,              # Broadcast to every motor on the bus
+        len(motor_ids) + 4,            # Packet length
+        SCS_SYNC_READ,                 # Sync read instruction
+        SCS_PRESENT_POSITION_L,        # Position register address
+        2,                             # Number of bytes to read (16-bit position)
+        *motor_ids                     # Motors that should answer, in order
+    ]
+    
+    checksum = calculate_checksum(packet_without_checksum)
+    return bytes(packet_without_checksum + [checksum])
+
+
+# Read requests never change, so build them once instead of on every loop
+READ_POSITION_PACKETS = {
+    motor_id: build_read_position_packet(motor_id) for motor_id in MOTOR_IDS
+}
+SYNC_READ_POSITIONS_PACKET = build_sync_read_positions_packet(MOTOR_IDS)
+
+# Reply buffers filled in place and reused on every read
+READ_RESPONSE = bytearray(8)
+SYNC_READ_RESPONSE = bytearray(8 * len(MOTOR_IDS))
+
+
+def read_exact_into(ser, buffer, timeout=TIMEOUT):
+    """
+    Fill a buffer from the serial port, returning as soon as it is full.
+    
+    Waits on the port's file descriptor with select() and reads with os.readv()
+    straight into the buffer, skipping pyserial's per-call read machinery.
+    
+    Args:
+        ser: Open serial connection (pyserial keeps its descriptor non-blocking)
+        buffer: bytearray to fill
+        timeout: Seconds to wait for the whole reply
+        
+    Returns:
+        Number of bytes received (less than len(buffer) on timeout)
+    """
+    fd = ser.fileno()
+    received = 0
+    deadline = time.perf_counter() + timeout
+    with memoryview(buffer) as view:
+        while received < len(buffer):
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                break
+            count = os.readv(fd, [view[received:]])
+            if count == 0:
+                break  # Port closed underneath us
+            received += count
+    return received
+
+
+def get_motor_position(ser, motor_id):
+    """
+    Read the current position from a Feetech servo motor.
+    
+    Args:
+        ser: Serial connection object
+        motor_id: Motor ID to query (1-6)
+        
+    Returns:
+        Motor position as integer (0-4095), or None if read fails
+    """
+    packet = READ_POSITION_PACKETS.get(motor_id) or build_read_position_packet(motor_id)
 
     try:
+        # Start from an empty input buffer so a stray byte can't shift the reply
+        ser.reset_input_buffer()
         ser.write(packet)
-        time.sleep(0.001)  # Brief delay for motor to process and respond
         
         # Expected response: [0xFF, 0xFF, ID, Length, Error, PosL, PosH, Checksum]
-        response = ser.read(8)
+        # Returns as soon as all 8 bytes are in, no fixed delay needed
+        response = READ_RESPONSE
+        received = read_exact_into(ser, response)
         
-        if len(response) >= 8 and response[0] == 0xFF and response[1] == 0xFF:
+        if (received >= 8 and response[0] == 0xFF and response[1] == 0xFF
+                and response[2] == motor_id and response[3] == 4):
             # Position is 16-bit little-endian (low byte first)
             position = response[5] | (response[6] << 8)
             return position
         
-        # Invalid or incomplete response
+        # Invalid, incomplete or out-of-sync response (the next read starts clean)
+        if received:
+            logger.warning(f"Motor {motor_id}: Unexpected reply {response[:received].hex(' ')}")
         return None
         
     except Exception as e:
         logger.error(f"Motor {motor_id}: Error reading position - {e}")
         return None
 
+
+def get_all_motor_positions(ser, motor_ids=MOTOR_IDS):
+    """
+    Read the current position of several motors with one SYNC_READ request.
+    
+    Every motor answers with its own status packet, so one bus turnaround
+    replaces a separate request/response per motor.
+    
+    Args:
+        ser: Serial connection object
+        motor_ids: Motor IDs to query
+        
+    Returns:
+        Dict of motor ID to position (0-4095), with None for motors that didn't reply
+    """
+    if motor_ids == MOTOR_IDS:
+        packet = SYNC_READ_POSITIONS_PACKET
+    else:
+        packet = build_sync_read_positions_packet(motor_ids)
+
+    positions = dict.fromkeys(motor_ids)
+    try:
+        # Start from an empty input buffer so a stray byte can't shift the replies
+        ser.reset_input_buffer()
+        ser.write(packet)
+        
+        # Expected response per motor: [0xFF, 0xFF, ID, Length, Error, PosL, PosH, Checksum]
+        if motor_ids == MOTOR_IDS:
+            response = SYNC_READ_RESPONSE
+        else:
+            response = bytearray(8 * len(motor_ids))
+        received = read_exact_into(ser, response)
+        
+        i = 0
+        while i + 8 <= received:
+            if (response[i] == 0xFF and response[i + 1] == 0xFF and response[i + 3] == 4
+                    and response[i + 2] in positions):
+                positions[response[i + 2]] = response[i + 5] | (response[i + 6] << 8)
+                i += 8
+            else:
+                i += 1  # Resync on the next header
+        
+    except Exception as e:
+        logger.error(f"Error reading motor positions - {e}")
+    
+    return positions
+
+
+def precise_sleep_until(deadline):
+    """
+    Sleep until a time.perf_counter() deadline.
+    
+    time.sleep can overshoot by a scheduler tick, so the OS sleep stops one
+    millisecond early and the rest is spun out on perf_counter.
+    
+    Args:
+        deadline: Target time in time.perf_counter() seconds
+    """
+    while (remaining := deadline - time.perf_counter()) > 0.001:
+        time.sleep(remaining - 0.001)
+    while time.perf_counter() < deadline:
+        pass
+
+
+def poll_motor_positions(ser, latest, new_reading, stop_event):
+    """
+    Read motor positions at SAMPLE_RATE until stop_event is set.
+    
+    Runs on its own thread so a slow stream() call on the main thread never
+    delays the next serial read. Only the newest reading is kept.
+    
+    Args:
+        ser: Serial connection object
+        latest: One-element list holding the newest (timestamp, positions), or None
+        new_reading: Condition guarding latest, notified after each reading
+        stop_event: Event that tells the thread to exit (set here if polling fails)
+    """
+    period = 1.0 / SAMPLE_RATE
+    next_deadline = time.perf_counter()
+    try:
+        while not stop_event.is_set():
+            timestamp = time.time()
+            
+            # Query all motors for their current positions in one request
+            positions = list(get_all_motor_positions(ser).values())  # In MOTOR_IDS order
+            with new_reading:
+                latest[0] = (timestamp, positions)
+                new_reading.notify()
+            
+            # Maintain consistent sampling rate on a fixed grid of deadlines
+            next_deadline += period
+            if next_deadline > time.perf_counter():
+                precise_sleep_until(next_deadline)
+            else:
+                next_deadline = time.perf_counter()  # Fell behind, resync instead of bursting
+    
+    except Exception as e:
+        logger.error(f"Motor polling stopped: {e}")
+        logger.error(traceback.format_exc())
+    
+    finally:
+        # Wake the main loop so it notices polling has ended
+        stop_event.set()
+        with new_reading:
+            new_reading.notify()
+
+
 @connect_python.main
 def main(connect_client: connect_python.Client):
     """
@@ -97,6 +300,8 @@ def main(connect_client: connect_python.Client):
     Runs continuously until stopped by the user or an error occurs.
     """
     ser = None
+    stop_event = threading.Event()
+    poller = None
     
     try:
         # Open serial connection to SO-101 Arm 2
@@ -109,31 +314,53 @@ def main(connect_client: connect_python.Client):
 
         # Main data acquisition loop
         logger.info(f"Starting data acquisition loop at {SAMPLE_RATE} Hz...")
+        # Serial reads run on a poller thread; this loop streams its newest reading
+        latest = [None]
+        new_reading = threading.Condition()
+        poller = threading.Thread(
+            target=poll_motor_positions,
+            args=(ser, latest, new_reading, stop_event),
+            name="motor_poller",
+            daemon=True,
+        )
+        poller.start()
+        
         loop_count = 0
+        last_sent = [None] * len(MOTOR_IDS)  # Last streamed position per motor
+        last_heartbeat = 0.0
         while True:
-            timestamp = time.time()
+            # Wait for the next reading and take it (readings stream at most once)
+            with new_reading:
+                new_reading.wait_for(lambda: latest[0] is not None or stop_event.is_set())
+                if latest[0] is None:
+                    break  # Polling stopped
+                timestamp, positions = latest[0]
+                latest[0] = None
             
-            # Query all motors for their current positions
-            positions = {
-                f"motor_{motor_id}": get_motor_position(ser, motor_id) 
-                for motor_id in MOTOR_IDS
-            }
+            valid_count = len(positions) - positions.count(None)
             
-            # Filter out any motors that failed to respond
-            valid_positions = {
-                name: pos for name, pos in positions.items() 
-                if pos is not None
-            }
+            # Stream motors that moved past the dead-band; on each heartbeat stream
+            # every motor that responded so idle channels stay current
+            heartbeat = timestamp - last_heartbeat >= HEARTBEAT_INTERVAL
+            if heartbeat:
+                last_heartbeat = timestamp
+            channel_names = []
+            channel_values = []
+            for i, pos in enumerate(positions):
+                if pos is None:
+                    continue  # Motor failed to respond
+                if heartbeat or last_sent[i] is None or abs(pos - last_sent[i]) >= DEADBAND:
+                    channel_names.append(CHANNEL_NAMES[i])
+                    channel_values.append(pos)
+                    last_sent[i] = pos
 
             # Log status every 10 iterations for debugging (more frequent)
             loop_count += 1
             if loop_count <= 5 or loop_count % 10 == 0:
-                logger.info(f"Arm 2 Loop {loop_count}: Read {len(valid_positions)}/{len(MOTOR_IDS)} motors - Positions: {valid_positions}")
+                logger.info(f"Arm 2 Loop {loop_count}: Read {valid_count}/{len(MOTOR_IDS)} motors - Positions: {dict(zip(CHANNEL_NAMES, positions))}")
 
             # Stream the data to the UI
-            if valid_positions:
-                channel_names = list(valid_positions.keys())
-                channel_values = list(valid_positions.values())
+            if channel_values:
                 connect_client.stream(
                     "so101_arm2_motors", 
                     timestamp, 
@@ -142,12 +369,9 @@ def main(connect_client: connect_python.Client):
                 )
                 if loop_count <= 3:
                     logger.info(f"Arm 2: Successfully streamed to 'so101_arm2_motors'")
-            else:
+            elif not valid_count:
                 if loop_count % 10 == 0:
                     logger.warning(f"Arm 2: No valid motor positions read at loop {loop_count}")
-            
-            # Maintain consistent sampling rate
-            time.sleep(1.0 / SAMPLE_RATE)
 
     except serial.SerialException as e:
         logger.error(f"Failed to open serial port {SERIAL_PORT}: {e}")
@@ -161,6 +385,11 @@ def main(connect_client: connect_python.Client):
         logger.error(traceback.format_exc())
         
     finally:
+        # Stop the poller before closing the port it reads from
+        stop_event.set()
+        if poller is not None:
+            poller.join(timeout=1.0)
+        
         # Clean up serial connection
         if ser and ser.is_open:
             ser.close()
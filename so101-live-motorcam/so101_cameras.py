@@ -8,6 +8,8 @@ Hardware: USB cameras connected to the system
 """
 
 import cv2
+import queue
+import threading
 import time
 import traceback
 import connect_python
@@ -19,6 +21,7 @@ CAMERA_2_INDEX = 2  # /dev/video2
 FRAME_WIDTH = 640
 FRAME_HEIGHT = 480
 TARGET_FPS = 30
+CAMERA_STREAMS = ("camera_1", "camera_2")  # Stream name per camera slot
 
 logger = connect_python.get_logger(__name__)
 
@@ -36,20 +39,27 @@ def initialize_camera(camera_index, width, height):
         OpenCV VideoCapture object, or None if initialization fails
     """
     try:
-        cap = cv2.VideoCapture(camera_index)
+        cap = cv2.VideoCapture(camera_index, cv2.CAP_V4L2)
         if not cap.isOpened():
             logger.error(f"Failed to open camera {camera_index}")
             return None
         
         # Set camera properties
+        # MJPG is compressed on the camera, so two 640x480 streams fit on one USB bus
+        # (raw YUYV at this size nearly saturates it); set it before the resolution
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
         cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
         cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
         cap.set(cv2.CAP_PROP_FPS, TARGET_FPS)
+        # Keep at most one frame queued in the driver so read() never returns a stale frame
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
         
-        # Verify actual resolution
+        # Verify actual resolution and pixel format
         actual_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         actual_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        logger.info(f"Camera {camera_index} initialized: {actual_width}x{actual_height}")
+        fourcc = int(cap.get(cv2.CAP_PROP_FOURCC))
+        fourcc_name = "".join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(4))
+        logger.info(f"Camera {camera_index} initialized: {actual_width}x{actual_height} {fourcc_name}")
         
         return cap
         
@@ -58,6 +68,69 @@ def initialize_camera(camera_index, width, height):
         return None
 
 
+def capture_frames(cap, camera_index, latest_frames, slot, new_frame, spare_buffers, stop_event):
+    """
+    Read frames from one camera and convert them to RGB until stop_event is set.
+    
+    Runs on its own thread so each camera's blocking read() overlaps the
+    other's, and since cvtColor releases the GIL both cameras convert in
+    parallel with the streaming loop. Only the newest frame is kept; older
+    unstreamed frames are dropped.
+    
+    Args:
+        cap: OpenCV VideoCapture object
+        camera_index: Camera device index, for log messages
+        latest_frames: Shared list holding the newest (timestamp, rgb_frame) per camera
+        slot: This camera's index into latest_frames
+        new_frame: Condition guarding latest_frames, notified after each frame
+        spare_buffers: Queue of RGB buffers this thread may convert into
+        stop_event: Event that tells the thread to exit
+    """
+    while not stop_event.is_set():
+        ret, frame = cap.read()
+        timestamp = time.time()
+        if not ret:
+            logger.warning(f"Failed to read from camera {camera_index}")
+            stop_event.wait(1.0 / TARGET_FPS)  # Don't spin on a camera that keeps failing
+            continue
+        
+        # Convert BGR to RGB (OpenCV uses BGR, most viewers expect RGB), reusing a
+        # buffer the streaming loop has handed back when one is available
+        try:
+            rgb_buffer = spare_buffers.get_nowait()
+        except queue.Empty:
+            rgb_buffer = None
+        rgb_frame = bgr_to_rgb(frame, rgb_buffer)
+        
+        with new_frame:
+            replaced = latest_frames[slot]
+            latest_frames[slot] = (timestamp, rgb_frame)
+            new_frame.notify()
+        if replaced is not None:
+            spare_buffers.put(replaced[1])  # Never streamed, so it can be reused right away
+
+
+def bgr_to_rgb(frame, rgb_buffer):
+    """
+    Convert a BGR frame to RGB into a reusable buffer.
+    
+    connect_python only has stream_rgb (no BGR variant or pixel-format option),
+    so the channel swap can't be skipped; it runs on the capture threads instead.
+    
+    Args:
+        frame: BGR frame from OpenCV
+        rgb_buffer: Buffer returned by the previous call, or None
+        
+    Returns:
+        RGB frame, written into rgb_buffer unless the frame size changed
+    """
+    if rgb_buffer is None or rgb_buffer.shape != frame.shape:
+        # Always C-contiguous, so reshape(-1) on the result is a view rather than a copy
+        rgb_buffer = np.empty(frame.shape, dtype=np.uint8)
+    cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb_buffer)
+    return rgb_buffer
+
+
 @connect_python.main
 def main(connect_client: connect_python.Client):
     """
@@ -68,6 +141,8 @@ def main(connect_client: connect_python.Client):
     """
     cap1 = None
     cap2 = None
+    stop_event = threading.Event()
+    capture_threads = []
     
     try:
         # Initialize both cameras
@@ -84,36 +159,44 @@ def main(connect_client: connect_python.Client):
         if cap2 is None:
             logger.warning(f"Camera {CAMERA_2_INDEX} unavailable, will stream single camera")
         
+        # Read each camera on its own thread so the two blocking reads overlap;
+        # read() waits for the driver's next frame, so the cameras set the pace
+        new_frame = threading.Condition()
+        latest_frames = [None, None]  # Newest (timestamp, rgb_frame) per camera, None once streamed
+        spare_buffers = [queue.SimpleQueue(), queue.SimpleQueue()]  # Streamed RGB buffers to reuse
+        for slot, (cap, camera_index) in enumerate(((cap1, CAMERA_1_INDEX), (cap2, CAMERA_2_INDEX))):
+            if cap is not None:
+                thread = threading.Thread(
+                    target=capture_frames,
+                    args=(cap, camera_index, latest_frames, slot, new_frame, spare_buffers[slot], stop_event),
+                    name=f"camera_{slot + 1}",
+                    daemon=True,
+                )
+                thread.start()
+                capture_threads.append(thread)
+        
         logger.info("Starting camera streaming loop...")
         frame_count = 0
         start_time = time.time()
         
         while True:
-            timestamp = time.time()
-            
-            # Capture from camera 1
-            if cap1 is not None:    # 
-                ret1, frame1 = cap1.read()
-                if ret1:
-                    # Convert BGR to RGB (OpenCV uses BGR, most viewers expect RGB)
-                    frame1_rgb = cv2.cvtColor(frame1, cv2.COLOR_BGR2RGB)
-                    # Flatten the RGB array to 1D for streaming
-                    rgb_data = frame1_rgb.flatten()
-                    connect_client.stream_rgb("camera_1", timestamp, frame1.shape[1], rgb_data)
-                else:
-                    logger.warning(f"Failed to read from camera {CAMERA_1_INDEX}")
+            # Wait for a new frame, then take the newest from each camera (None if nothing new)
+            with new_frame:
+                if not new_frame.wait_for(lambda: latest_frames != [None, None], timeout=1.0):
+                    continue
+                captured_frames = latest_frames[:]
+                latest_frames[0] = latest_frames[1] = None
             
-            # Capture from camera 2
-            if cap2 is not None:
-                ret2, frame2 = cap2.read()
-                if ret2:
-                    # Convert BGR to RGB
-                    frame2_rgb = cv2.cvtColor(frame2, cv2.COLOR_BGR2RGB)
-                    # Flatten the RGB array to 1D for streaming
-                    rgb_data = frame2_rgb.flatten()
-                    connect_client.stream_rgb("camera_2", timestamp, frame2.shape[1], rgb_data)
-                else:
-                    logger.warning(f"Failed to read from camera {CAMERA_2_INDEX}")
+            # Stream every camera that produced a frame
+            for slot, captured in enumerate(captured_frames):
+                if captured is None:
+                    continue
+                timestamp, rgb_frame = captured
+                # Flatten the RGB array to 1D for streaming (a view, no copy)
+                rgb_data = rgb_frame.reshape(-1)
+                connect_client.stream_rgb(CAMERA_STREAMS[slot], timestamp, rgb_frame.shape[1], rgb_data)
+                # Hand the buffer back to its capture thread for a later frame
+                spare_buffers[slot].put(rgb_frame)
             
             # Log FPS every 100 frames
             frame_count += 1
@@ -121,9 +204,6 @@ def main(connect_client: connect_python.Client):
                 elapsed = time.time() - start_time
                 fps = frame_count / elapsed
                 logger.info(f"Frame {frame_count}: Streaming at {fps:.1f} FPS")
-            
-            # Rate limiting to avoid overwhelming the system
-            time.sleep(1.0 / TARGET_FPS)
     
     except KeyboardInterrupt:
         logger.info("Camera stream stopped by user.")
@@ -133,6 +213,11 @@ def main(connect_client: connect_python.Client):
         logger.error(traceback.format_exc())
     
     finally:
+        # Stop the capture threads before releasing the cameras they read from
+        stop_event.set()
+        for thread in capture_threads:
+            thread.join(timeout=1.0)
+        
         # Clean up camera resources
         if cap1 is not None:
             cap1.release()
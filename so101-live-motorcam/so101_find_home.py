@@ -20,39 +20,59 @@ SERIAL_PORT = "/dev/ttyACM0"  # Serial port for SO-101 connection
 BAUD_RATE = 1_000_000
 MOTOR_IDS = [1, 2, 3, 4, 5, 6]
 TIMEOUT = 0.05
+INTER_BYTE_TIMEOUT = 0.002
 
 # Feetech Protocol Constants
 SCS_READ = 0x02
+SCS_SYNC_READ = 0x82
+SCS_BROADCAST_ID = 0xFE
 SCS_PRESENT_POSITION_L = 56
 
 logger = connect_python.get_logger(__name__)
 
 
 def calculate_checksum(packet):
-    total = sum(packet[2:])
+    total = sum(packet) - packet[0] - packet[1]  # Skip the 0xFF headers without slicing
     return ~total & 0xFF
 
 
-def get_motor_position(ser, motor_id):
-    length = 4
+def build_read_position_packet(motor_id):
     packet_without_checksum = [
-        0xFF, 0xFF,
-        motor_id,
-        length,
-        SCS_READ,
-        SCS_PRESENT_POSITION_L,
-        2
+        0xFF, 0xFF, motor_id, 4, SCS_READ, SCS_PRESENT_POSITION_L, 2
     ]
-    
-    checksum = calculate_checksum(packet_without_checksum)
-    packet = bytes(packet_without_checksum + [checksum])
+    return bytes(packet_without_checksum + [calculate_checksum(packet_without_checksum)])
+
+
+def build_sync_read_positions_packet(motor_ids):
+    packet_without_checksum = [
+        0xFF, 0xFF, SCS_BROADCAST_ID, len(motor_ids) + 4, SCS_SYNC_READ,
+        SCS_PRESENT_POSITION_L, 2, *motor_ids
+    ]
+    return bytes(packet_without_checksum + [calculate_checksum(packet_without_checksum)])
+
+
+# Read requests never change, so build them once at import
+READ_POSITION_PACKETS = {
+    motor_id: build_read_position_packet(motor_id) for motor_id in MOTOR_IDS
+}
+SYNC_READ_POSITIONS_PACKET = build_sync_read_positions_packet(MOTOR_IDS)
+
+# Reply buffers filled with readinto() and reused on every read
+READ_RESPONSE = bytearray(8)
+SYNC_READ_RESPONSE = bytearray(8 * len(MOTOR_IDS))
+
+
+def get_motor_position(ser, motor_id):
+    packet = READ_POSITION_PACKETS.get(motor_id) or build_read_position_packet(motor_id)
 
     try:
+        ser.reset_input_buffer()  # Drop stray bytes so they can't shift the reply
         ser.write(packet)
-        time.sleep(0.001)
-        response = ser.read(8)
+        response = READ_RESPONSE
+        received = ser.readinto(response)
         
-        if len(response) >= 8 and response[0] == 0xFF and response[1] == 0xFF:
+        if (received >= 8 and response[0] == 0xFF and response[1] == 0xFF
+                and response[2] == motor_id and response[3] == 4):
             position = response[5] | (response[6] << 8)
             return position
         return None
@@ -61,6 +81,37 @@ def get_motor_position(ser, motor_id):
         return None
 
 
+def get_all_motor_positions(ser, motor_ids=MOTOR_IDS):
+    """Read every motor's position with one SYNC_READ; None for motors that didn't reply."""
+    if motor_ids == MOTOR_IDS:
+        packet = SYNC_READ_POSITIONS_PACKET
+    else:
+        packet = build_sync_read_positions_packet(motor_ids)
+
+    positions = dict.fromkeys(motor_ids)
+    try:
+        ser.reset_input_buffer()  # Drop stray bytes so they can't shift the replies
+        ser.write(packet)
+        # One 8-byte status packet per motor: FF FF id len err posL posH checksum
+        if motor_ids == MOTOR_IDS:
+            response = SYNC_READ_RESPONSE
+        else:
+            response = bytearray(8 * len(motor_ids))
+        received = ser.readinto(response)
+        
+        i = 0
+        while i + 8 <= received:
+            if (response[i] == 0xFF and response[i + 1] == 0xFF and response[i + 3] == 4
+                    and response[i + 2] in positions):
+                positions[response[i + 2]] = response[i + 5] | (response[i + 6] << 8)
+                i += 8
+            else:
+                i += 1
+    except Exception as e:
+        logger.error(f"Error reading motor positions - {e}")
+    return positions
+
+
 @connect_python.main
 def main(connect_client: connect_python.Client):
     """
@@ -70,7 +121,9 @@ def main(connect_client: connect_python.Client):
     
     try:
         logger.info(f"Connecting to {SERIAL_PORT}...")
-        ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=TIMEOUT)
+        ser = serial.Serial(
+            SERIAL_PORT, BAUD_RATE, timeout=TIMEOUT, inter_byte_timeout=INTER_BYTE_TIMEOUT
+        )
         logger.info("Connection established.\n")
         
         logger.info("=" * 60)
@@ -84,34 +137,34 @@ def main(connect_client: connect_python.Client):
         
         # Read positions continuously
         count = 0
+        next_deadline = time.perf_counter()
         while True:
             count += 1
             
             # Read all motor positions
-            positions = {}
-            all_valid = True
-            for motor_id in MOTOR_IDS:
-                pos = get_motor_position(ser, motor_id)
-                if pos is not None:
-                    positions[motor_id] = pos
-                else:
-                    all_valid = False
-                    break
+            positions = get_all_motor_positions(ser)
+            all_valid = None not in positions.values()
             
             # Display every 10th reading (2 times per second at 20Hz)
+            # One log record per display instead of one per line
             if all_valid and count % 10 == 0:
-                logger.info(f"\n--- Current Positions (reading #{count}) ---")
-                for motor_id in MOTOR_IDS:
-                    logger.info(f"Motor {motor_id}: {positions[motor_id]}")
-                
-                # Show as Python dict format
-                logger.info("\nCopy this to your script as HOME_POSITIONS:")
-                logger.info("HOME_POSITIONS = {")
-                for motor_id in MOTOR_IDS:
-                    logger.info(f"    {motor_id}: {positions[motor_id]},")
-                logger.info("}")
+                logger.info(
+                    "\n--- Current Positions (reading #%d) ---\n%s\n"
+                    # Show as Python dict format
+                    "\nCopy this to your script as HOME_POSITIONS:\n"
+                    "HOME_POSITIONS = {\n%s\n}",
+                    count,
+                    "\n".join(f"Motor {motor_id}: {positions[motor_id]}" for motor_id in MOTOR_IDS),
+                    "\n".join(f"    {motor_id}: {positions[motor_id]}," for motor_id in MOTOR_IDS),
+                )
             
-            time.sleep(0.05)  # 20Hz update rate
+            # 20Hz update rate
+            next_deadline += 0.05
+            remaining = next_deadline - time.perf_counter()
+            if remaining > 0:
+                time.sleep(remaining)
+            else:
+                next_deadline = time.perf_counter()  # Fell behind, resync instead of bursting
             
     except KeyboardInterrupt:
         logger.info("\n\n" + "=" * 60)
@@ -119,11 +172,11 @@ def main(connect_client: connect_python.Client):
         logger.info("=" * 60)
         
         # Read one final time
-        final_positions = {}
-        for motor_id in MOTOR_IDS:
-            pos = get_motor_position(ser, motor_id)
-            if pos is not None:
-                final_positions[motor_id] = pos
+        final_positions = {
+            motor_id: pos
+            for motor_id, pos in get_all_motor_positions(ser).items()
+            if pos is not None
+        }
         
         logger.info("\nHOME_POSITIONS = {")
         for motor_id in MOTOR_IDS:
@@ -14,6 +14,7 @@ SERIAL_PORT = "/dev/ttyACM0"
 BAUD_RATE = 1_000_000
 MOTOR_IDS = [1, 2, 3, 4, 5, 6]
 TIMEOUT = 0.05
+INTER_BYTE_TIMEOUT = 0.002
 
 # UPDATE THESE VALUES:
 HOME_POSITIONS = {
@@ -40,6 +41,9 @@ HOME_POSITIONS = {
 # Feetech Protocol
 SCS_WRITE = 0x03
 SCS_READ = 0x02
+SCS_SYNC_READ = 0x82
+SCS_SYNC_WRITE = 0x83
+SCS_BROADCAST_ID = 0xFE
 SCS_GOAL_POSITION_L = 42
 SCS_PRESENT_POSITION_L = 56
 SCS_MODE = 33
@@ -50,7 +54,7 @@ logger = connect_python.get_logger(__name__)
 
 
 def calculate_checksum(packet):
-    total = sum(packet[2:])
+    total = sum(packet) - packet[0] - packet[1]  # Skip the 0xFF headers without slicing
     return ~total & 0xFF
 
 
@@ -66,23 +70,45 @@ def set_motor_position(ser, motor_id, position):
     
     packet = bytes(packet_without_checksum + [calculate_checksum(packet_without_checksum)])
     ser.write(packet)
-    time.sleep(0.002)
-    if ser.in_waiting > 0:
-        ser.read(ser.in_waiting)
     return True
 
 
+def sync_write_register(ser, register_address, values_by_motor, num_bytes=2):
+    """Write one register on several motors with a single SYNC_WRITE packet."""
+    params = []
+    for motor_id, value in values_by_motor.items():
+        params.append(motor_id)
+        params.extend((value >> (8 * i)) & 0xFF for i in range(num_bytes))  # Little-endian
+    
+    packet_without_checksum = [
+        0xFF, 0xFF, SCS_BROADCAST_ID, len(params) + 4, SCS_SYNC_WRITE,
+        register_address, num_bytes, *params
+    ]
+    packet = bytes(packet_without_checksum + [calculate_checksum(packet_without_checksum)])
+    ser.write(packet)
+    return True
+
+
+def sync_write_goal(ser, positions_by_motor):
+    positions = {
+        motor_id: max(0, min(4095, int(position)))
+        for motor_id, position in positions_by_motor.items()
+    }
+    return sync_write_register(ser, SCS_GOAL_POSITION_L, positions, 2)
+
+
 def read_motor_register(ser, motor_id, register_address, num_bytes=2):
     packet_without_checksum = [
         0xFF, 0xFF, motor_id, 4, SCS_READ, register_address, num_bytes
     ]
     packet = bytes(packet_without_checksum + [calculate_checksum(packet_without_checksum)])
     
+    ser.reset_input_buffer()  # Drop stray bytes so they can't shift the reply
     ser.write(packet)
-    time.sleep(0.001)
     response = ser.read(5 + num_bytes + 1)
     
-    if len(response) >= (5 + num_bytes) and response[0] == 0xFF and response[1] == 0xFF:
+    if (len(response) >= (5 + num_bytes) and response[0] == 0xFF and response[1] == 0xFF
+            and response[2] == motor_id and response[3] == num_bytes + 2):
         if num_bytes == 2:
             return response[5] | (response[6] << 8)     # r5 + r6*(2^8=256)
         else:
@@ -94,6 +120,45 @@ def get_motor_position(ser, motor_id):
     return read_motor_register(ser, motor_id, SCS_PRESENT_POSITION_L, 2)
 
 
+def build_sync_read_positions_packet(motor_ids):
+    packet_without_checksum = [
+        0xFF, 0xFF, SCS_BROADCAST_ID, len(motor_ids) + 4, SCS_SYNC_READ,
+        SCS_PRESENT_POSITION_L, 2, *motor_ids
+    ]
+    return bytes(packet_without_checksum + [calculate_checksum(packet_without_checksum)])
+
+
+# Built once at import, the sync read request never changes
+SYNC_READ_POSITIONS_PACKET = build_sync_read_positions_packet(MOTOR_IDS)
+
+
+def get_all_motor_positions(ser, motor_ids=MOTOR_IDS):
+    """Read every motor's position with one SYNC_READ; None for motors that didn't reply."""
+    if motor_ids == MOTOR_IDS:
+        packet = SYNC_READ_POSITIONS_PACKET
+    else:
+        packet = build_sync_read_positions_packet(motor_ids)
+
+    positions = dict.fromkeys(motor_ids)
+    try:
+        ser.reset_input_buffer()  # Drop stray bytes so they can't shift the replies
+        ser.write(packet)
+        # One 8-byte status packet per motor: FF FF id len err posL posH checksum
+        response = ser.read(8 * len(motor_ids))
+        
+        i = 0
+        while i + 8 <= len(response):
+            if (response[i] == 0xFF and response[i + 1] == 0xFF and response[i + 3] == 4
+                    and response[i + 2] in positions):
+                positions[response[i + 2]] = response[i + 5] | (response[i + 6] << 8)
+                i += 8
+            else:
+                i += 1
+    except Exception as e:
+        logger.error(f"Error reading motor positions - {e}")
+    return positions
+
+
 def set_motor_mode(ser, motor_id, mode=0):
     packet_without_checksum = [
         0xFF, 0xFF, motor_id, 4, SCS_WRITE, SCS_MODE, mode
@@ -135,36 +200,38 @@ def main(connect_client: connect_python.Client):
     try:
         # Connect
         logger.info(f"Connecting to {SERIAL_PORT}...")
-        ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=TIMEOUT)
+        ser = serial.Serial(
+            SERIAL_PORT, BAUD_RATE, timeout=TIMEOUT, inter_byte_timeout=INTER_BYTE_TIMEOUT
+        )
         
         # Read current positions
         logger.info("\nCurrent positions:")
-        for motor_id in MOTOR_IDS:
-            pos = get_motor_position(ser, motor_id)
+        for motor_id, pos in get_all_motor_positions(ser).items():
             if pos is not None:
                 logger.info(f"  Motor {motor_id}: {pos}")
         
         # Configure motors
         logger.info("\nConfiguring motors...")
-        for motor_id in MOTOR_IDS:
-            set_motor_mode(ser, motor_id, mode=0)
-            set_motor_speed(ser, motor_id, speed=100)  # Fast movement
-            enable_motor_torque(ser, motor_id)
+        # One SYNC_WRITE per register configures every motor at once
+        sync_write_register(ser, SCS_MODE, dict.fromkeys(MOTOR_IDS, 0), 1)
+        time.sleep(0.01)
+        sync_write_register(ser, SCS_GOAL_SPEED_L, dict.fromkeys(MOTOR_IDS, 100), 2)  # Fast movement
+        time.sleep(0.005)
+        sync_write_register(ser, SCS_TORQUE_ENABLE, dict.fromkeys(MOTOR_IDS, 1), 1)
+        time.sleep(0.005)
         
         # Send home commands
         logger.info("\nMoving to HOME positions...")
         for motor_id in MOTOR_IDS:
-            target = HOME_POSITIONS[motor_id]
-            logger.info(f"  Motor {motor_id} → {target}")
-            set_motor_position(ser, motor_id, target)
+            logger.info(f"  Motor {motor_id} → {HOME_POSITIONS[motor_id]}")
+        sync_write_goal(ser, {motor_id: HOME_POSITIONS[motor_id] for motor_id in MOTOR_IDS})
         
         # Wait for movement to complete
         time.sleep(2.0)
         
         # Verify final positions
         logger.info("\nFinal positions:")
-        for motor_id in MOTOR_IDS:
-            pos = get_motor_position(ser, motor_id)
+        for motor_id, pos in get_all_motor_positions(ser).items():
             target = HOME_POSITIONS[motor_id]
             error = abs(target - pos) if pos is not None else None
             if pos is not None:
@@ -8,6 +8,7 @@ Hardware: SO-101 Robot with Feetech servo motors
 Protocol: Feetech SCS (Serial Command System)
 """
 
+import os
 import serial
 import time
 import traceback
@@ -50,6 +51,38 @@ SCS_GOAL_SPEED_L = 46          # Register address for goal speed (lower byte)
 logger = connect_python.get_logger(__name__)
 
 
+def enable_low_latency(ser):
+    """
+    Put a USB-serial port into low-latency mode so replies aren't held back.
+    
+    Sets ASYNC_LOW_LATENCY via TIOCSSERIAL and, for FTDI-style adapters that
+    expose one, drops the sysfs latency_timer from its 16 ms default to 1 ms.
+    
+    Args:
+        ser: Serial connection object
+        
+    Returns:
+        True if low-latency mode was enabled, False otherwise
+    """
+    enabled = False
+    try:
+        ser.set_low_latency_mode(True)
+        enabled = True
+    except (OSError, ValueError) as e:
+        logger.warning(f"{ser.port}: low-latency mode not supported - {e}")
+    
+    latency_timer = f"/sys/bus/usb-serial/devices/{os.path.basename(ser.port)}/latency_timer"
+    if os.path.exists(latency_timer):
+        try:
+            with open(latency_timer, "w") as f:
+                f.write("1")
+            enabled = True
+        except OSError as e:
+            logger.warning(f"{ser.port}: could not set latency_timer - {e}")
+    
+    return enabled
+
+
 def calculate_checksum(packet):
     """
     Calculate the checksum for a Feetech SCS protocol packet.
@@ -106,13 +139,12 @@ def set_motor_position(ser, motor_id, position, debug=False):
 
     try:
         ser.write(packet)
-        time.sleep(0.002)  # Brief delay for motor to process command
         
-        # Try to read response (some servos send acknowledgment)
-        if ser.in_waiting > 0:
-            response = ser.read(ser.in_waiting)
-            if debug:
-                logger.info(f"  Response: {' '.join([f'{b:02X}' for b in response])}")
+        # When debugging, wait for the 6-byte acknowledgment (bounded by the
+        # port timeout); otherwise read_motor_register drops it before reading
+        if debug:
+            response = ser.read(6)
+            logger.info(f"  Response: {' '.join([f'{b:02X}' for b in response]) or 'none'}")
         
         return True
         
@@ -148,6 +180,7 @@ def read_motor_register(ser, motor_id, register_address, num_bytes=2):
     packet = bytes(packet_without_checksum + [checksum])
 
     try:
+        ser.reset_input_buffer()  # Drop any late write ACK so it can't shift the reply
         ser.write(packet)
         time.sleep(0.001)
         
@@ -225,7 +258,7 @@ def set_motor_mode(ser, motor_id, mode=0):
     
     try:
         ser.write(packet)
-        time.sleep(0.01)
+        ser.flush()  # Block only until the packet has left the OS TX buffer
         mode_name = {0: "Position", 1: "Speed", 3: "Step"}
         logger.info(f"Motor {motor_id}: Set to {mode_name.get(mode, 'Unknown')} mode")
         return True
@@ -266,7 +299,7 @@ def set_motor_speed(ser, motor_id, speed=100):
     
     try:
         ser.write(packet)
-        time.sleep(0.005)
+        ser.flush()  # Block only until the packet has left the OS TX buffer
         logger.info(f"Motor {motor_id}: Speed set to {speed}")
         return True
     except Exception as e:
@@ -301,7 +334,7 @@ def enable_motor_torque(ser, motor_id):
     
     try:
         ser.write(packet)
-        time.sleep(0.005)
+        ser.flush()  # Block only until the packet has left the OS TX buffer
         logger.info(f"Motor {motor_id}: Torque enabled")
         return True
     except Exception as e:
@@ -320,6 +353,7 @@ def main(connect_client: connect_python.Client):
         # Open serial connection
         logger.info(f"Connecting to {SERIAL_PORT} at {BAUD_RATE} baud...")
         ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=TIMEOUT)
+        enable_low_latency(ser)
         logger.info("Connection established successfully.")
         
         # TODO: Add your new control logic here
@@ -7,7 +7,10 @@ This creates a leader-follower setup where moving Arm 1 causes Arm 2 to mirror.
 Current mapping: 1:1 (Motor 1 → Motor 1, Motor 2 → Motor 2, etc.)
 """
 
+import os
+import select
 import serial
+import threading
 import time
 import traceback
 import connect_python
@@ -17,105 +20,281 @@ LEADER_PORT = "/dev/ttyACM1"    # Arm 1 - we READ from this
 FOLLOWER_PORT = "/dev/ttyACM0"  # Arm 2 - we WRITE to this
 BAUD_RATE = 1_000_000
 MOTOR_IDS = [1, 2, 3, 4, 5, 6]
+MOTOR_INDEX = {motor_id: i for i, motor_id in enumerate(MOTOR_IDS)}  # Position in per-motor lists
 TIMEOUT = 0.05
+READ_TIMEOUT = 0.005  # Leader SYNC_READ replies land in well under 1 ms; don't wait 50 ms for a lost one
 
 UPDATE_RATE = 50.0  # Hz - how often to read leader and update follower
+DEADBAND = 2              # Encoder counts a leader motor must move before it is re-sent
+HEARTBEAT_INTERVAL = 1.0  # Seconds between full re-sends, in case a broadcast was lost
+
+# Stream channels per motor in MOTOR_IDS order: (leader reading, follower command)
+CHANNEL_NAMES = [
+    (f"leader_motor_{motor_id}", f"follower_cmd_{motor_id}") for motor_id in MOTOR_IDS
+]
 
 # Feetech Protocol
-SCS_WRITE = 0x03
-SCS_READ = 0x02
+SCS_SYNC_READ = 0x82
+SCS_SYNC_WRITE = 0x83
+SCS_BROADCAST_ID = 0xFE
 SCS_GOAL_POSITION_L = 42
 SCS_PRESENT_POSITION_L = 56
 SCS_MODE = 33
 SCS_GOAL_SPEED_L = 46
 SCS_TORQUE_ENABLE = 40
+SCS_STATUS_RETURN_LEVEL = 8  # 0=reply to READ/PING only, 1=reply to everything (factory default)
 
 logger = connect_python.get_logger(__name__)
 
 
+def enable_low_latency(ser):
+    """Ask the USB-serial driver to hand over received bytes immediately."""
+    try:
+        ser.set_low_latency_mode(True)  # TIOCSSERIAL with ASYNC_LOW_LATENCY
+    except (OSError, ValueError) as e:
+        logger.warning(f"{ser.port}: low-latency mode not supported - {e}")
+    
+    # FTDI-style adapters batch replies for latency_timer ms (default 16)
+    latency_timer = f"/sys/bus/usb-serial/devices/{os.path.basename(ser.port)}/latency_timer"
+    if os.path.exists(latency_timer):
+        try:
+            with open(latency_timer, "w") as f:
+                f.write("1")
+        except OSError as e:
+            logger.warning(f"{ser.port}: could not set latency_timer - {e}")
+
+
 def calculate_checksum(packet):
-    total = sum(packet[2:])
+    total = sum(packet) - packet[0] - packet[1]  # Skip the 0xFF headers without slicing
     return ~total & 0xFF
 
 
-def set_motor_position(ser, motor_id, position):
-    """Send position command to a motor."""
-    position = max(0, min(4095, int(position)))
-    pos_low = position & 0xFF
-    pos_high = (position >> 8) & 0xFF
+def read_exact_into(ser, buffer, timeout=READ_TIMEOUT):
+    """Fill buffer straight from the port's descriptor; returns the byte count, short only on timeout."""
+    fd = ser.fileno()
+    received = 0
+    deadline = time.perf_counter() + timeout
+    with memoryview(buffer) as view:
+        while received < len(buffer):
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                break
+            count = os.readv(fd, [view[received:]])
+            if count == 0:
+                break  # Port closed underneath us
+            received += count
+    return received
+
+
+def write_all(ser, data):
+    """Write every byte of data straight to the port's non-blocking descriptor."""
+    fd = ser.fileno()
+    written = 0
+    with memoryview(data) as view:
+        while written < len(view):
+            try:
+                written += os.write(fd, view[written:])  # May be short if the TX buffer is nearly full
+            except BlockingIOError:
+                select.select([], [fd], [], ser.write_timeout)  # TX buffer full, wait for room
+    return written
+
+
+def sync_write_register(ser, register_address, values_by_motor, num_bytes=2):
+    """Write one register on several motors with a single SYNC_WRITE packet."""
+    params = []
+    for motor_id, value in values_by_motor.items():
+        params.append(motor_id)
+        params.extend((value >> (8 * i)) & 0xFF for i in range(num_bytes))  # Little-endian
     
     packet_without_checksum = [
-        0xFF, 0xFF, motor_id, 5, SCS_WRITE, 
-        SCS_GOAL_POSITION_L, pos_low, pos_high
+        0xFF, 0xFF, SCS_BROADCAST_ID, len(params) + 4, SCS_SYNC_WRITE,
+        register_address, num_bytes, *params
     ]
-    
     packet = bytes(packet_without_checksum + [calculate_checksum(packet_without_checksum)])
     ser.write(packet)
-    time.sleep(0.001)  # Brief delay
-    if ser.in_waiting > 0:
-        ser.read(ser.in_waiting)  # Clear response
+    ser.flush()  # Wait for TX to drain so setup writes land in order
     return True
 
 
-def read_motor_register(ser, motor_id, register_address, num_bytes=2):
-    """Read a register from a motor."""
+def build_sync_write_positions_packet(motor_ids):
+    """Build a goal-position SYNC_WRITE template with the position bytes and checksum left zero."""
+    packet = bytearray([
+        0xFF, 0xFF, SCS_BROADCAST_ID, 3 * len(motor_ids) + 4, SCS_SYNC_WRITE,
+        SCS_GOAL_POSITION_L, 2
+    ])
+    for motor_id in motor_ids:
+        packet += bytes([motor_id, 0, 0])
+    packet.append(0)
+    return packet
+
+
+def build_sync_read_positions_packet(motor_ids):
     packet_without_checksum = [
-        0xFF, 0xFF, motor_id, 4, SCS_READ, register_address, num_bytes
+        0xFF, 0xFF, SCS_BROADCAST_ID, len(motor_ids) + 4, SCS_SYNC_READ,
+        SCS_PRESENT_POSITION_L, 2, *motor_ids
     ]
-    packet = bytes(packet_without_checksum + [calculate_checksum(packet_without_checksum)])
+    return bytes(packet_without_checksum + [calculate_checksum(packet_without_checksum)])
+
+
+# Only the position bytes and checksum change between ticks, so build the
+# rest of the packet once and patch it in place
+SYNC_WRITE_POSITIONS_PACKET = build_sync_write_positions_packet(MOTOR_IDS)
+SYNC_READ_POSITIONS_PACKET = build_sync_read_positions_packet(MOTOR_IDS)
+
+# Reply buffer reused by every full SYNC_READ so the read path doesn't allocate
+SYNC_READ_RESPONSE = bytearray(8 * len(MOTOR_IDS))
+
+
+def sync_write_positions(ser, motor_ids, positions):
+    """Send positions[i] to motor_ids[i] for several motors with one SYNC_WRITE packet."""
+    if motor_ids == MOTOR_IDS:
+        packet = SYNC_WRITE_POSITIONS_PACKET
+    else:
+        packet = build_sync_write_positions_packet(motor_ids)
     
-    ser.write(packet)
-    time.sleep(0.001)
-    response = ser.read(5 + num_bytes + 1)
+    for i, position in enumerate(positions):
+        position = max(0, min(4095, int(position)))
+        slot = 8 + 3 * i  # Each motor's (id, low, high) triple follows the 7-byte header
+        packet[slot] = position & 0xFF
+        packet[slot + 1] = position >> 8
+    with memoryview(packet) as view:
+        packet[-1] = ~sum(view[2:-1]) & 0xFF  # Sums the bytes in C, no slice copy
+    write_all(ser, packet)  # Broadcast packets get no status reply, nothing to drain
+    return True
+
+
+def sync_read_positions(ser, motor_ids):
+    """Read positions with one SYNC_READ, in motor_ids order; None where a motor didn't reply."""
+    if motor_ids == MOTOR_IDS:
+        packet, response, index = SYNC_READ_POSITIONS_PACKET, SYNC_READ_RESPONSE, MOTOR_INDEX
+    else:
+        packet = build_sync_read_positions_packet(motor_ids)
+        response = bytearray(8 * len(motor_ids))
+        index = {motor_id: i for i, motor_id in enumerate(motor_ids)}
     
-    if len(response) >= (5 + num_bytes) and response[0] == 0xFF and response[1] == 0xFF:
-        if num_bytes == 2:
-            return response[5] | (response[6] << 8)
+    ser.reset_input_buffer()  # Drop a late reply from a timed-out tick so it can't pass as this one
+    write_all(ser, packet)
+    # One 8-byte status packet per motor: FF FF id len err posL posH checksum
+    received = read_exact_into(ser, response)
+    
+    positions = [None] * len(motor_ids)
+    i = 0
+    while i + 8 <= received:
+        if (response[i] == 0xFF and response[i + 1] == 0xFF and response[i + 3] == 4
+                and response[i + 2] in index):
+            positions[index[response[i + 2]]] = response[i + 5] | (response[i + 6] << 8)
+            i += 8
         else:
-            return response[5]
-    return None
+            i += 1
+    return positions
 
 
-def get_motor_position(ser, motor_id):
-    """Read current position from a motor."""
-    return read_motor_register(ser, motor_id, SCS_PRESENT_POSITION_L, 2)
+def publish(mailbox, reading):
+    """Put a reading in a one-slot (latest, condition) mailbox, replacing any untaken one."""
+    latest, new_reading = mailbox
+    with new_reading:
+        latest[0] = reading
+        new_reading.notify()
 
 
-def set_motor_mode(ser, motor_id, mode=0):
-    """Set motor control mode (0=position)."""
-    packet_without_checksum = [
-        0xFF, 0xFF, motor_id, 4, SCS_WRITE, SCS_MODE, mode
-    ]
-    packet = bytes(packet_without_checksum + [calculate_checksum(packet_without_checksum)])
-    ser.write(packet)
-    time.sleep(0.01)
-    return True
+def take_latest(mailbox, stop_event):
+    """Wait for a reading in the mailbox and take it; None once stop_event is set."""
+    latest, new_reading = mailbox
+    with new_reading:
+        new_reading.wait_for(lambda: latest[0] is not None or stop_event.is_set())
+        reading, latest[0] = latest[0], None
+    return reading
 
 
-def set_motor_speed(ser, motor_id, speed=500):
-    """Set motor movement speed."""
-    speed_low = speed & 0xFF
-    speed_high = (speed >> 8) & 0xFF
-    
-    packet_without_checksum = [
-        0xFF, 0xFF, motor_id, 5, SCS_WRITE, 
-        SCS_GOAL_SPEED_L, speed_low, speed_high
-    ]
-    packet = bytes(packet_without_checksum + [calculate_checksum(packet_without_checksum)])
-    ser.write(packet)
-    time.sleep(0.005)
-    return True
+def start_tick_timer(period):
+    """Arm a CLOCK_MONOTONIC timerfd that fires every period seconds; None where timerfd isn't available."""
+    if not hasattr(os, "timerfd_create"):  # Python < 3.13 or not Linux
+        return None
+    timer_fd = os.timerfd_create(time.CLOCK_MONOTONIC)
+    os.timerfd_settime(timer_fd, initial=period, interval=period)
+    return timer_fd
 
 
-def enable_motor_torque(ser, motor_id):
-    """Enable motor torque."""
-    packet_without_checksum = [
-        0xFF, 0xFF, motor_id, 4, SCS_WRITE, SCS_TORQUE_ENABLE, 1
-    ]
-    packet = bytes(packet_without_checksum + [calculate_checksum(packet_without_checksum)])
-    ser.write(packet)
-    time.sleep(0.005)
-    return True
+def read_leader_positions(ser, mailboxes, stop_event):
+    """Read the leader arm at UPDATE_RATE on its own thread, publishing each (timestamp, positions)."""
+    period = 1.0 / UPDATE_RATE
+    timer_fd = start_tick_timer(period)
+    next_deadline = time.perf_counter()
+    try:
+        while not stop_event.is_set():
+            timestamp = time.time()
+            positions = sync_read_positions(ser, MOTOR_IDS)
+            for mailbox in mailboxes:
+                publish(mailbox, (timestamp, positions))
+            
+            if timer_fd is not None:
+                # Blocks until the next kernel tick; one read swallows any ticks we overran
+                os.read(timer_fd, 8)
+            else:
+                # Sleep to a fixed grid of deadlines so read time doesn't stretch the period
+                next_deadline += period
+                remaining = next_deadline - time.perf_counter()
+                if remaining > 0:
+                    time.sleep(remaining)
+                else:
+                    next_deadline = time.perf_counter()  # Fell behind, resync instead of bursting
+    except Exception as e:
+        logger.error(f"Leader read error: {e}")
+        logger.error(traceback.format_exc())
+    finally:
+        if timer_fd is not None:
+            os.close(timer_fd)
+        stop_event.set()
+        for _, new_reading in mailboxes:
+            with new_reading:
+                new_reading.notify_all()  # Wake consumers so they see the stop
+
+
+def write_follower_positions(ser, mailbox, stop_event):
+    """Command the follower from each new leader reading on its own thread."""
+    missed_reads = 0
+    last_sent = [None] * len(MOTOR_IDS)  # Last commanded position per motor
+    last_heartbeat = 0.0
+    last_report = time.time()
+    try:
+        while (reading := take_latest(mailbox, stop_event)) is not None:
+            timestamp, leader_positions = reading
+            
+            # A short read is treated as a missed tick rather than sending a partial command
+            if None not in leader_positions:
+                # Only command motors that moved past the dead-band, plus all of
+                # them on each heartbeat; skip the write when nothing moved
+                heartbeat = timestamp - last_heartbeat >= HEARTBEAT_INTERVAL
+                if heartbeat:
+                    last_heartbeat = timestamp
+                changed = [
+                    i for i, pos in enumerate(leader_positions)
+                    if heartbeat or last_sent[i] is None or abs(pos - last_sent[i]) >= DEADBAND
+                ]
+                if len(changed) == len(MOTOR_IDS):
+                    sync_write_positions(ser, MOTOR_IDS, leader_positions)
+                elif changed:
+                    sync_write_positions(
+                        ser, [MOTOR_IDS[i] for i in changed], [leader_positions[i] for i in changed]
+                    )
+                for i in changed:
+                    last_sent[i] = leader_positions[i]
+            else:
+                missed_reads += 1
+            
+            if timestamp - last_report >= 2.0:
+                if missed_reads:
+                    logger.warning(f"{missed_reads} incomplete leader reads in the last 2 seconds")
+                    missed_reads = 0
+                last_report = timestamp
+    except Exception as e:
+        logger.error(f"Follower write error: {e}")
+        logger.error(traceback.format_exc())
+    finally:
+        stop_event.set()
 
 
 @connect_python.main
@@ -127,23 +306,31 @@ def main(connect_client: connect_python.Client):
     """
     ser_leader = None
     ser_follower = None
+    stop_event = threading.Event()
+    threads = []
     
     try:
         # Connect to both arms
         logger.info(f"Connecting to LEADER arm at {LEADER_PORT}...")
-        ser_leader = serial.Serial(LEADER_PORT, BAUD_RATE, timeout=TIMEOUT)
+        ser_leader = serial.Serial(LEADER_PORT, BAUD_RATE, timeout=READ_TIMEOUT)
+        enable_low_latency(ser_leader)
         logger.info("Leader connected!")
         
         logger.info(f"Connecting to FOLLOWER arm at {FOLLOWER_PORT}...")
         ser_follower = serial.Serial(FOLLOWER_PORT, BAUD_RATE, timeout=TIMEOUT)
+        enable_low_latency(ser_follower)
         logger.info("Follower connected!")
         
         # Configure follower motors for position control
         logger.info("\nConfiguring follower arm motors...")
-        for motor_id in MOTOR_IDS:
-            set_motor_mode(ser_follower, motor_id, mode=0)
-            set_motor_speed(ser_follower, motor_id, speed=0)  # 0 = maximum speed!
-            enable_motor_torque(ser_follower, motor_id)
+        # One SYNC_WRITE per register configures every motor at once.
+        # Level 0 makes only READ/PING reply, so per-motor writes leave nothing
+        # to drain; the EEPROM stays locked, so this lasts until a power cycle.
+        sync_write_register(ser_follower, SCS_STATUS_RETURN_LEVEL, dict.fromkeys(MOTOR_IDS, 0), 1)
+        sync_write_register(ser_follower, SCS_MODE, dict.fromkeys(MOTOR_IDS, 0), 1)
+        sync_write_register(ser_follower, SCS_GOAL_SPEED_L, dict.fromkeys(MOTOR_IDS, 0), 2)  # 0 = maximum speed!
+        sync_write_register(ser_follower, SCS_TORQUE_ENABLE, dict.fromkeys(MOTOR_IDS, 1), 1)
+        time.sleep(0.01)  # Let the servos apply the new mode before the first goal
         logger.info("Follower arm ready!")
         
         # Clear streams
@@ -152,42 +339,48 @@ def main(connect_client: connect_python.Client):
         logger.info("\n🤖 Teleoperation ACTIVE! Move the leader arm (ACM1)...")
         logger.info("Press Ctrl+C to stop.\n")
         
+        # Serial I/O runs on its own threads: the reader publishes each leader
+        # reading to the follower writer and to this thread, which only streams
+        # and logs, so a slow stream() call never delays a command
+        to_follower = ([None], threading.Condition())
+        to_stream = ([None], threading.Condition())
+        threads = [
+            threading.Thread(
+                target=read_leader_positions,
+                args=(ser_leader, [to_follower, to_stream], stop_event),
+                name="leader_reader",
+                daemon=True,
+            ),
+            threading.Thread(
+                target=write_follower_positions,
+                args=(ser_follower, to_follower, stop_event),
+                name="follower_writer",
+                daemon=True,
+            ),
+        ]
+        for thread in threads:
+            thread.start()
+        
         loop_count = 0
         
         # Main teleoperation loop
-        while True:
-            timestamp = time.time()
+        while (reading := take_latest(to_stream, stop_event)) is not None:
+            timestamp, leader_positions = reading
             loop_count += 1
             
-            # Read all positions from leader arm
-            leader_positions = {}
-            for motor_id in MOTOR_IDS:
-                pos = get_motor_position(ser_leader, motor_id)
-                if pos is not None:
-                    leader_positions[motor_id] = pos
-            
-            # Command follower arm to match leader positions
-            for motor_id in MOTOR_IDS:
-                if motor_id in leader_positions:
-                    target_position = leader_positions[motor_id]
-                    set_motor_position(ser_follower, motor_id, target_position)
-            
             # Log status every 2 seconds
             if loop_count % (int(UPDATE_RATE) * 2) == 0:
-                logger.info(f"Teleoperation active - Leader positions: {leader_positions}")
+                logger.info(f"Teleoperation active - Leader positions: {dict(zip(MOTOR_IDS, leader_positions))}")
             
-            # Stream data for visualization
-            for motor_id in MOTOR_IDS:
-                if motor_id in leader_positions:
-                    connect_client.stream(
-                        "teleoperation",
-                        timestamp,
-                        names=[f"leader_motor_{motor_id}", f"follower_cmd_{motor_id}"],
-                        values=[leader_positions[motor_id], leader_positions[motor_id]]
-                    )
-            
-            # Wait for next update
-            time.sleep(1.0 / UPDATE_RATE)
+            # Stream data for visualization, every motor in one call
+            names = []
+            values = []
+            for i, pos in enumerate(leader_positions):
+                if pos is not None:
+                    names += CHANNEL_NAMES[i]
+                    values += [pos, pos]
+            if values:
+                connect_client.stream("teleoperation", timestamp, names=names, values=values)
         
     except serial.SerialException as e:
         logger.error(f"Serial connection error: {e}")
@@ -200,6 +393,9 @@ def main(connect_client: connect_python.Client):
         logger.error(traceback.format_exc())
         
     finally:
+        stop_event.set()
+        for thread in threads:
+            thread.join(timeout=1.0)
         if ser_leader and ser_leader.is_open:
             ser_leader.close()
             logger.info("Leader connection closed.")
@@ -7,21 +7,68 @@ Contains low-level protocol implementation for reading/writing motor registers.
 Protocol: Feetech SCS (Serial Controlled Servo)
 """
 
+import os
 import serial
 import time
+import connect_python
 
 # Feetech Protocol Constants
 SCS_WRITE = 0x03
 SCS_READ = 0x02
+SCS_SYNC_READ = 0x82
+SCS_SYNC_WRITE = 0x83
+SCS_BROADCAST_ID = 0xFE
 SCS_GOAL_POSITION_L = 42
 SCS_PRESENT_POSITION_L = 56
 SCS_MODE = 33
 SCS_GOAL_SPEED_L = 46
 SCS_TORQUE_ENABLE = 40
 
+logger = connect_python.get_logger(__name__)
+
 # Encoder range
 ENCODER_MAX = 4095
 
+# WRITE packets keyed by (motor ID, register, byte count), each stored with the
+# sum of its fixed bytes so only the value bytes are added per send
+WRITE_PACKETS = {}
+
+# SYNC_WRITE goal-position packets keyed by motor ID tuple; only the position
+# bytes and checksum are rewritten on each send
+SYNC_WRITE_PACKETS = {}
+
+
+def enable_low_latency(ser):
+    """
+    Ask the USB-serial driver to deliver received bytes immediately.
+    
+    Sets ASYNC_LOW_LATENCY on the port and, on adapters that expose one, drops
+    the sysfs latency_timer from its 16 ms default to 1 ms.
+    
+    Args:
+        ser: Serial port object
+        
+    Returns:
+        True if either setting was applied, False if the port supports neither
+    """
+    enabled = False
+    try:
+        ser.set_low_latency_mode(True)
+        enabled = True
+    except (OSError, ValueError) as e:
+        # cdc-acm devices don't support TIOCSSERIAL
+        logger.warning(f"{ser.port}: low-latency mode not supported - {e}")
+    
+    latency_timer = f"/sys/bus/usb-serial/devices/{os.path.basename(ser.port)}/latency_timer"
+    if os.path.exists(latency_timer):
+        try:
+            with open(latency_timer, "w") as f:
+                f.write("1")
+            enabled = True
+        except OSError as e:
+            logger.warning(f"{ser.port}: could not set latency_timer - {e}")
+    return enabled
+
 
 def calculate_checksum(packet):
     """
@@ -37,6 +84,40 @@ def calculate_checksum(packet):
     return ~total & 0xFF
 
 
+def write_motor_register(ser, motor_id, register_address, value, num_bytes=2):
+    """
+    Write a register on a Feetech servo motor.
+    
+    Patches the value into a cached packet and updates the checksum from the
+    fixed bytes' stored sum, so repeated writes don't rebuild the packet.
+    
+    Args:
+        ser: Serial port object
+        motor_id: Motor ID (1-6 typically)
+        register_address: Register to write to
+        value: Value to write (little-endian)
+        num_bytes: Number of bytes to write (1 or 2)
+        
+    Returns:
+        True if command sent successfully
+    """
+    key = (motor_id, register_address, num_bytes)
+    template = WRITE_PACKETS.get(key)
+    if template is None:
+        packet = bytearray([
+            0xFF, 0xFF, motor_id, num_bytes + 3, SCS_WRITE, register_address
+        ] + [0] * (num_bytes + 1))
+        template = WRITE_PACKETS[key] = (packet, sum(packet[2:6]))
+    
+    packet, total = template
+    for i in range(num_bytes):
+        packet[6 + i] = (value >> (8 * i)) & 0xFF
+        total += packet[6 + i]
+    packet[-1] = ~total & 0xFF
+    ser.write(packet)
+    return True
+
+
 def read_motor_register(ser, motor_id, register_address, num_bytes=2):
     """
     Read a register from a Feetech servo motor.
@@ -56,8 +137,7 @@ def read_motor_register(ser, motor_id, register_address, num_bytes=2):
     packet = bytes(packet_without_checksum + [calculate_checksum(packet_without_checksum)])
     
     ser.write(packet)
-    time.sleep(0.001)
-    response = ser.read(5 + num_bytes + 1)
+    response = ser.read(5 + num_bytes + 1)  # Blocks until the reply arrives or the port times out
     
     if len(response) >= (5 + num_bytes) and response[0] == 0xFF and response[1] == 0xFF:
         if num_bytes == 2:
@@ -81,6 +161,40 @@ def get_motor_position(ser, motor_id):
     return read_motor_register(ser, motor_id, SCS_PRESENT_POSITION_L, 2)
 
 
+def sync_read_positions(ser, motor_ids):
+    """
+    Read current positions from several motors with one SYNC_READ packet.
+    
+    Args:
+        ser: Serial port object
+        motor_ids: Motor IDs to read
+        
+    Returns:
+        Dict of motor ID to position (0-4095); motors that didn't reply are omitted
+    """
+    packet_without_checksum = [
+        0xFF, 0xFF, SCS_BROADCAST_ID, len(motor_ids) + 4, SCS_SYNC_READ,
+        SCS_PRESENT_POSITION_L, 2, *motor_ids
+    ]
+    packet = bytes(packet_without_checksum + [calculate_checksum(packet_without_checksum)])
+    
+    ser.reset_input_buffer()  # Drop stray bytes so they can't shift the replies
+    ser.write(packet)
+    # One 8-byte status packet per motor: FF FF id len err posL posH checksum
+    response = ser.read(8 * len(motor_ids))
+    
+    positions = {}
+    i = 0
+    while i + 8 <= len(response):
+        if (response[i] == 0xFF and response[i + 1] == 0xFF and response[i + 3] == 4
+                and response[i + 2] in motor_ids):
+            positions[response[i + 2]] = response[i + 5] | (response[i + 6] << 8)
+            i += 8
+        else:
+            i += 1  # Not a status header, resync on the next byte
+    return positions
+
+
 def set_motor_position(ser, motor_id, position):
     """
     Send position command to a motor.
@@ -94,22 +208,50 @@ def set_motor_position(ser, motor_id, position):
         True if command sent successfully
     """
     position = max(0, min(ENCODER_MAX, int(position)))
-    pos_low = position & 0xFF
-    pos_high = (position >> 8) & 0xFF
-    
-    packet_without_checksum = [
-        0xFF, 0xFF, motor_id, 5, SCS_WRITE, 
-        SCS_GOAL_POSITION_L, pos_low, pos_high
-    ]
-    
-    packet = bytes(packet_without_checksum + [calculate_checksum(packet_without_checksum)])
-    ser.write(packet)
+    write_motor_register(ser, motor_id, SCS_GOAL_POSITION_L, position, 2)
     time.sleep(0.001)
     if ser.in_waiting > 0:
         ser.read(ser.in_waiting)  # Clear response buffer
     return True
 
 
+def sync_write_positions(ser, motor_ids, positions):
+    """
+    Send position commands to several motors with one SYNC_WRITE packet.
+    
+    Broadcast packets get no reply, so there is nothing to wait for or drain.
+    
+    Args:
+        ser: Serial port object
+        motor_ids: Motor IDs to command
+        positions: Target positions (0-4095), in the same order as motor_ids
+        
+    Returns:
+        True if command sent successfully
+    """
+    key = tuple(motor_ids)
+    packet = SYNC_WRITE_PACKETS.get(key)
+    if packet is None:
+        # Header, then an (id, low, high) triple per motor, then the checksum
+        packet = bytearray([
+            0xFF, 0xFF, SCS_BROADCAST_ID, 3 * len(key) + 4, SCS_SYNC_WRITE,
+            SCS_GOAL_POSITION_L, 2
+        ])
+        for motor_id in key:
+            packet += bytes([motor_id, 0, 0])
+        packet.append(0)
+        SYNC_WRITE_PACKETS[key] = packet
+    
+    for i, position in enumerate(positions):
+        position = max(0, min(ENCODER_MAX, int(position)))
+        packet[8 + 3 * i] = position & 0xFF
+        packet[9 + 3 * i] = position >> 8
+    with memoryview(packet) as view:
+        packet[-1] = ~sum(view[2:-1]) & 0xFF
+    ser.write(packet)
+    return True
+
+
 def set_motor_mode(ser, motor_id, mode=0):
     """
     Set motor control mode.
@@ -122,11 +264,7 @@ def set_motor_mode(ser, motor_id, mode=0):
     Returns:
         True if command sent successfully
     """
-    packet_without_checksum = [
-        0xFF, 0xFF, motor_id, 4, SCS_WRITE, SCS_MODE, mode
-    ]
-    packet = bytes(packet_without_checksum + [calculate_checksum(packet_without_checksum)])
-    ser.write(packet)
+    write_motor_register(ser, motor_id, SCS_MODE, mode, 1)
     time.sleep(0.01)
     return True
 
@@ -143,15 +281,7 @@ def set_motor_speed(ser, motor_id, speed=500):
     Returns:
         True if command sent successfully
     """
-    speed_low = speed & 0xFF
-    speed_high = (speed >> 8) & 0xFF
-    
-    packet_without_checksum = [
-        0xFF, 0xFF, motor_id, 5, SCS_WRITE, 
-        SCS_GOAL_SPEED_L, speed_low, speed_high
-    ]
-    packet = bytes(packet_without_checksum + [calculate_checksum(packet_without_checksum)])
-    ser.write(packet)
+    write_motor_register(ser, motor_id, SCS_GOAL_SPEED_L, speed, 2)
     time.sleep(0.005)
     return True
 
@@ -167,11 +297,7 @@ def enable_motor_torque(ser, motor_id):
     Returns:
         True if command sent successfully
     """
-    packet_without_checksum = [
-        0xFF, 0xFF, motor_id, 4, SCS_WRITE, SCS_TORQUE_ENABLE, 1
-    ]
-    packet = bytes(packet_without_checksum + [calculate_checksum(packet_without_checksum)])
-    ser.write(packet)
+    write_motor_register(ser, motor_id, SCS_TORQUE_ENABLE, 1, 1)
     time.sleep(0.005)
     return True
 
@@ -187,10 +313,6 @@ def disable_motor_torque(ser, motor_id):
     Returns:
         True if command sent successfully
     """
-    packet_without_checksum = [
-        0xFF, 0xFF, motor_id, 4, SCS_WRITE, SCS_TORQUE_ENABLE, 0
-    ]
-    packet = bytes(packet_without_checksum + [calculate_checksum(packet_without_checksum)])
-    ser.write(packet)
+    write_motor_register(ser, motor_id, SCS_TORQUE_ENABLE, 0, 1)
     time.sleep(0.005)
     return True
@@ -7,13 +7,17 @@ Configuration done via dropdown menu in app.connect.
 
 import serial
 import cv2
+import queue
+import threading
 import time
 import math
 import traceback
 import connect_python
+import numpy as np
 from feetech_interface import (
-    get_motor_position,
-    set_motor_position,
+    enable_low_latency,
+    sync_read_positions,
+    sync_write_positions,
     set_motor_mode,
     set_motor_speed,
     enable_motor_torque,
@@ -32,6 +36,7 @@ CAMERA_2_INDEX = 2
 FRAME_WIDTH = 640
 FRAME_HEIGHT = 480
 TARGET_FPS = 30
+CAMERA_STREAMS = ("camera_1", "camera_2")
 
 CONTROL_RATE = 50.0
 CAMERA_RATE = 30.0
@@ -61,6 +66,49 @@ def initialize_camera(camera_index, width, height):
         return None
 
 
+def capture_frames(cap, camera_index, latest_frames, slot, frame_lock, spare_buffers, stop_event):
+    """Read one camera on its own thread, keeping only its newest (timestamp, rgb_frame)."""
+    while not stop_event.is_set():
+        ret, frame = cap.read()  # Blocks for the camera's next frame, off the control loop
+        timestamp = time.time()
+        if not ret:
+            logger.warning(f"Failed to read from camera {camera_index}")
+            stop_event.wait(1.0 / TARGET_FPS)  # Don't spin on a camera that keeps failing
+            continue
+        
+        # Convert into a buffer the control loop has handed back, so steady-state
+        # capture doesn't allocate a new RGB array per frame
+        try:
+            rgb_frame = spare_buffers.get_nowait()
+        except queue.Empty:
+            rgb_frame = None
+        if rgb_frame is None or rgb_frame.shape != frame.shape:
+            rgb_frame = np.empty(frame.shape, dtype=np.uint8)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb_frame)
+        
+        with frame_lock:
+            replaced = latest_frames[slot]
+            latest_frames[slot] = (timestamp, rgb_frame)
+        if replaced is not None:
+            spare_buffers.put(replaced[1])  # Never streamed, so it can be reused right away
+
+
+def start_capture_threads(caps, latest_frames, frame_lock, spare_buffers, stop_event):
+    """Start a capture thread for each opened camera; returns the threads."""
+    threads = []
+    for slot, (cap, camera_index) in enumerate(caps):
+        if cap is not None:
+            thread = threading.Thread(
+                target=capture_frames,
+                args=(cap, camera_index, latest_frames, slot, frame_lock, spare_buffers[slot], stop_event),
+                name=f"camera_{slot + 1}",
+                daemon=True,
+            )
+            thread.start()
+            threads.append(thread)
+    return threads
+
+
 def encoder_to_radians(encoder_value, home_position, motor_id):
     """Convert encoder position to radians."""
     adjusted = (encoder_value + JOINT_ENCODER_OFFSETS[motor_id]) % ENCODER_MAX
@@ -90,11 +138,15 @@ def main(connect_client: connect_python.Client):
     ser_follower = None
     cap1 = None
     cap2 = None
+    stop_event = threading.Event()
+    capture_threads = []
     
     try:
         logger.info(f"\nConnecting to arms...")
         ser_leader = serial.Serial(LEADER_PORT, BAUD_RATE, timeout=SERIAL_TIMEOUT)
         ser_follower = serial.Serial(FOLLOWER_PORT, BAUD_RATE, timeout=SERIAL_TIMEOUT)
+        enable_low_latency(ser_leader)
+        enable_low_latency(ser_follower)
         logger.info("✓ Arms connected!")
         
         logger.info("Configuring follower motors...")
@@ -108,6 +160,14 @@ def main(connect_client: connect_python.Client):
         cap1 = initialize_camera(CAMERA_1_INDEX, FRAME_WIDTH, FRAME_HEIGHT)
         cap2 = initialize_camera(CAMERA_2_INDEX, FRAME_WIDTH, FRAME_HEIGHT)
         
+        # Cameras are read on their own threads so read() never stalls control
+        latest_frames = [None, None]
+        frame_lock = threading.Lock()
+        spare_buffers = [queue.SimpleQueue(), queue.SimpleQueue()]  # Streamed RGB buffers to reuse
+        capture_threads = start_capture_threads(
+            ((cap1, CAMERA_1_INDEX), (cap2, CAMERA_2_INDEX)), latest_frames, frame_lock, spare_buffers, stop_event
+        )
+        
         connect_client.clear_stream("motor_positions")
         connect_client.clear_stream("pose")
         
@@ -125,19 +185,15 @@ def main(connect_client: connect_python.Client):
             loop_count += 1
             
             # Read leader and command follower
-            leader_positions = {}
-            for motor_id in MOTOR_IDS:
-                pos = get_motor_position(ser_leader, motor_id)
-                if pos is not None:
-                    leader_positions[motor_id] = pos
-                    set_motor_position(ser_follower, motor_id, pos)
+            leader_positions = sync_read_positions(ser_leader, MOTOR_IDS)
+            if leader_positions:
+                sync_write_positions(ser_follower, list(leader_positions), list(leader_positions.values()))
             
-            # Read visualization arm
-            viz_positions = {}
-            for motor_id in MOTOR_IDS:
-                pos = get_motor_position(viz_serial, motor_id)
-                if pos is not None:
-                    viz_positions[motor_id] = pos
+            # Read visualization arm (the leader was just read)
+            if visualize_leader:
+                viz_positions = leader_positions
+            else:
+                viz_positions = sync_read_positions(viz_serial, MOTOR_IDS)
             
             # Stream motor positions (only visualized arm)
             if len(viz_positions) == len(MOTOR_IDS):
@@ -157,17 +213,15 @@ def main(connect_client: connect_python.Client):
             if time.time() - last_camera_time >= (1.0 / CAMERA_RATE):
                 last_camera_time = time.time()
                 
-                if cap1 is not None:
-                    ret1, frame1 = cap1.read()
-                    if ret1:
-                        frame1_rgb = cv2.cvtColor(frame1, cv2.COLOR_BGR2RGB)
-                        connect_client.stream_rgb("camera_1", timestamp, frame1.shape[1], frame1_rgb.flatten())
+                with frame_lock:
+                    captured_frames = latest_frames[:]
+                    latest_frames[0] = latest_frames[1] = None
                 
-                if cap2 is not None:
-                    ret2, frame2 = cap2.read()
-                    if ret2:
-                        frame2_rgb = cv2.cvtColor(frame2, cv2.COLOR_BGR2RGB)
-                        connect_client.stream_rgb("camera_2", timestamp, frame2.shape[1], frame2_rgb.flatten())
+                for slot, captured in enumerate(captured_frames):
+                    if captured is not None:
+                        frame_time, rgb_frame = captured
+                        connect_client.stream_rgb(CAMERA_STREAMS[slot], frame_time, rgb_frame.shape[1], rgb_frame.reshape(-1))
+                        spare_buffers[slot].put(rgb_frame)
             
             # Logging
             if loop_count % (int(CONTROL_RATE) * 2) == 0:
@@ -187,6 +241,9 @@ def main(connect_client: connect_python.Client):
             ser_leader.close()
         if ser_follower and ser_follower.is_open:
             ser_follower.close()
+        stop_event.set()
+        for thread in capture_threads:
+            thread.join(timeout=1.0)
         if cap1:
             cap1.release()
         if cap2:
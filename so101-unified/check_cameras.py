@@ -79,7 +79,7 @@ def main(connect_client: connect_python.Client):
                 ret1, frame1 = cap1.read()
                 if ret1:
                     frame1_rgb = cv2.cvtColor(frame1, cv2.COLOR_BGR2RGB)
-                    rgb_data = frame1_rgb.flatten()
+                    rgb_data = frame1_rgb.reshape(-1)  # Contiguous, so a view rather than a copy
                     connect_client.stream_rgb("camera_1", timestamp, frame1.shape[1], rgb_data)
                 else:
                     logger.warning(f"Failed to read from camera {CAMERA_1_INDEX}")
@@ -89,7 +89,7 @@ def main(connect_client: connect_python.Client):
                 ret2, frame2 = cap2.read()
                 if ret2:
                     frame2_rgb = cv2.cvtColor(frame2, cv2.COLOR_BGR2RGB)
-                    rgb_data = frame2_rgb.flatten()
+                    rgb_data = frame2_rgb.reshape(-1)
                     connect_client.stream_rgb("camera_2", timestamp, frame2.shape[1], rgb_data)
                 else:
                     logger.warning(f"Failed to read from camera {CAMERA_2_INDEX}")
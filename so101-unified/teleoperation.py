@@ -12,8 +12,9 @@ import time
 import traceback
 import connect_python
 from feetech_interface import (
-    get_motor_position,
-    set_motor_position,
+    enable_low_latency,
+    sync_read_positions,
+    sync_write_positions,
     set_motor_mode,
     set_motor_speed,
     enable_motor_torque
@@ -41,10 +42,12 @@ def main(connect_client: connect_python.Client):
         # Connect to both arms
         logger.info(f"Connecting to LEADER arm at {LEADER_PORT}...")
         ser_leader = serial.Serial(LEADER_PORT, BAUD_RATE, timeout=TIMEOUT)
+        enable_low_latency(ser_leader)
         logger.info("Leader connected!")
         
         logger.info(f"Connecting to FOLLOWER arm at {FOLLOWER_PORT}...")
         ser_follower = serial.Serial(FOLLOWER_PORT, BAUD_RATE, timeout=TIMEOUT)
+        enable_low_latency(ser_follower)
         logger.info("Follower connected!")
         
         # Configure follower motors for position control
@@ -69,18 +72,12 @@ def main(connect_client: connect_python.Client):
             timestamp = time.time()
             loop_count += 1
             
-            # Read all positions from leader arm
-            leader_positions = {}
-            for motor_id in MOTOR_IDS:
-                pos = get_motor_position(ser_leader, motor_id)
-                if pos is not None:
-                    leader_positions[motor_id] = pos
+            # Read all positions from leader arm in one round-trip
+            leader_positions = sync_read_positions(ser_leader, MOTOR_IDS)
             
-            # Command follower arm to match leader positions
-            for motor_id in MOTOR_IDS:
-                if motor_id in leader_positions:
-                    target_position = leader_positions[motor_id]
-                    set_motor_position(ser_follower, motor_id, target_position)
+            # Command follower arm to match leader positions in one packet
+            if leader_positions:
+                sync_write_positions(ser_follower, list(leader_positions), list(leader_positions.values()))
             
             # Log status every 2 seconds
             if loop_count % (int(UPDATE_RATE) * 2) == 0:
@@ -12,13 +12,17 @@ This is the all-in-one script for full teleoperation experience.
 
 import serial
 import cv2
+import queue
+import threading
 import time
 import math
 import traceback
 import connect_python
+import numpy as np
 from feetech_interface import (
-    get_motor_position,
-    set_motor_position,
+    enable_low_latency,
+    sync_read_positions,
+    sync_write_positions,
     set_motor_mode,
     set_motor_speed,
     enable_motor_torque,
@@ -38,6 +42,7 @@ CAMERA_2_INDEX = 2
 FRAME_WIDTH = 640
 FRAME_HEIGHT = 480
 TARGET_FPS = 30
+CAMERA_STREAMS = ("camera_1", "camera_2")  # Stream name per camera slot
 
 # --- Update Rates ---
 CONTROL_RATE = 50.0  # Hz - teleoperation control loop
@@ -102,6 +107,49 @@ def initialize_camera(camera_index, width, height):
         return None
 
 
+def capture_frames(cap, camera_index, latest_frames, slot, frame_lock, spare_buffers, stop_event):
+    """Read one camera on its own thread, keeping only its newest (timestamp, rgb_frame)."""
+    while not stop_event.is_set():
+        ret, frame = cap.read()  # Blocks for the camera's next frame, off the control loop
+        timestamp = time.time()
+        if not ret:
+            logger.warning(f"Failed to read from camera {camera_index}")
+            stop_event.wait(1.0 / TARGET_FPS)  # Don't spin on a camera that keeps failing
+            continue
+        
+        # Convert into a buffer the control loop has handed back, so steady-state
+        # capture doesn't allocate a new RGB array per frame
+        try:
+            rgb_frame = spare_buffers.get_nowait()
+        except queue.Empty:
+            rgb_frame = None
+        if rgb_frame is None or rgb_frame.shape != frame.shape:
+            rgb_frame = np.empty(frame.shape, dtype=np.uint8)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb_frame)
+        
+        with frame_lock:
+            replaced = latest_frames[slot]
+            latest_frames[slot] = (timestamp, rgb_frame)
+        if replaced is not None:
+            spare_buffers.put(replaced[1])  # Never streamed, so it can be reused right away
+
+
+def start_capture_threads(caps, latest_frames, frame_lock, spare_buffers, stop_event):
+    """Start a capture thread for each opened camera; returns the threads."""
+    threads = []
+    for slot, (cap, camera_index) in enumerate(caps):
+        if cap is not None:
+            thread = threading.Thread(
+                target=capture_frames,
+                args=(cap, camera_index, latest_frames, slot, frame_lock, spare_buffers[slot], stop_event),
+                name=f"camera_{slot + 1}",
+                daemon=True,
+            )
+            thread.start()
+            threads.append(thread)
+    return threads
+
+
 def encoder_to_radians(encoder_value, home_position, motor_id):
     """Convert encoder position (0-4095) to radians relative to home."""
     adjusted_encoder = encoder_value + JOINT_ENCODER_OFFSETS[motor_id]
@@ -131,15 +179,19 @@ def main(connect_client: connect_python.Client):
     ser_follower = None
     cap1 = None
     cap2 = None
+    stop_event = threading.Event()
+    capture_threads = []
     
     try:
         # ========== SERIAL CONNECTION ==========
         logger.info(f"Connecting to LEADER arm at {LEADER_PORT}...")
         ser_leader = serial.Serial(LEADER_PORT, BAUD_RATE, timeout=SERIAL_TIMEOUT)
+        enable_low_latency(ser_leader)
         logger.info("Leader connected!")
         
         logger.info(f"Connecting to FOLLOWER arm at {FOLLOWER_PORT}...")
         ser_follower = serial.Serial(FOLLOWER_PORT, BAUD_RATE, timeout=SERIAL_TIMEOUT)
+        enable_low_latency(ser_follower)
         logger.info("Follower connected!")
         
         # Configure follower motors
@@ -160,6 +212,15 @@ def main(connect_client: connect_python.Client):
         if cap2 is None:
             logger.warning(f"Camera {CAMERA_2_INDEX} unavailable")
         
+        # Cameras are read on their own threads so a blocking read() never
+        # stalls the control loop; the loop just takes the newest frames
+        latest_frames = [None, None]  # Newest (timestamp, rgb_frame) per camera, None once streamed
+        frame_lock = threading.Lock()
+        spare_buffers = [queue.SimpleQueue(), queue.SimpleQueue()]  # Streamed RGB buffers to reuse
+        capture_threads = start_capture_threads(
+            ((cap1, CAMERA_1_INDEX), (cap2, CAMERA_2_INDEX)), latest_frames, frame_lock, spare_buffers, stop_event
+        )
+        
         # ========== CLEAR STREAMS ==========
         connect_client.clear_stream("leader_positions")
         connect_client.clear_stream("follower_commands")
@@ -189,16 +250,11 @@ def main(connect_client: connect_python.Client):
             loop_count += 1
             
             # --- MOTOR CONTROL ---
-            leader_positions = {}
-            for motor_id in MOTOR_IDS:
-                pos = get_motor_position(ser_leader, motor_id)
-                if pos is not None:
-                    leader_positions[motor_id] = pos
+            leader_positions = sync_read_positions(ser_leader, MOTOR_IDS)
             
-            # Command follower to match leader
-            for motor_id in MOTOR_IDS:
-                if motor_id in leader_positions:
-                    set_motor_position(ser_follower, motor_id, leader_positions[motor_id])
+            # Command follower to match leader in one packet
+            if leader_positions:
+                sync_write_positions(ser_follower, list(leader_positions), list(leader_positions.values()))
             
             # --- STREAM MOTOR DATA ---
             if len(leader_positions) == len(MOTOR_IDS):
@@ -239,19 +295,16 @@ def main(connect_client: connect_python.Client):
                 last_camera_time = time.time()
                 camera_frame_count += 1
                 
-                if cap1 is not None:
-                    ret1, frame1 = cap1.read()
-                    if ret1:
-                        frame1_rgb = cv2.cvtColor(frame1, cv2.COLOR_BGR2RGB)
-                        rgb_data = frame1_rgb.flatten()
-                        connect_client.stream_rgb("camera_1", timestamp, frame1.shape[1], rgb_data)
+                with frame_lock:
+                    captured_frames = latest_frames[:]
+                    latest_frames[0] = latest_frames[1] = None
                 
-                if cap2 is not None:
-                    ret2, frame2 = cap2.read()
-                    if ret2:
-                        frame2_rgb = cv2.cvtColor(frame2, cv2.COLOR_BGR2RGB)
-                        rgb_data = frame2_rgb.flatten()
-                        connect_client.stream_rgb("camera_2", timestamp, frame2.shape[1], rgb_data)
+                for slot, captured in enumerate(captured_frames):
+                    if captured is not None:
+                        frame_time, rgb_frame = captured
+                        rgb_data = rgb_frame.reshape(-1)  # cvtColor output is contiguous, so a view, no copy
+                        connect_client.stream_rgb(CAMERA_STREAMS[slot], frame_time, rgb_frame.shape[1], rgb_data)
+                        spare_buffers[slot].put(rgb_frame)  # Hand back for a later frame
             
             # --- LOGGING ---
             if loop_count % (int(CONTROL_RATE) * 2) == 0:
@@ -281,6 +334,11 @@ def main(connect_client: connect_python.Client):
             ser_follower.close()
             logger.info("Follower serial connection closed.")
         
+        # Stop the capture threads before releasing the cameras they read from
+        stop_event.set()
+        for thread in capture_threads:
+            thread.join(timeout=1.0)
+        
         # Clean up cameras
         if cap1 is not None:
             cap1.release()